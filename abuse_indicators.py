@@ -1,7 +1,7 @@
 # Comprehensive list of abuse indicators categorized by type of coercive control
 # These keywords are used to scan documents for potential abuse patterns.
 
-ABUSE_INDICATORS = {
+_RAW_INDICATORS = {
     "Isolation": [
         # Original
         "don't talk to", "stay away from", "no friends", "bad influence",
@@ -16,7 +16,7 @@ ABUSE_INDICATORS = {
         # NDCC Ch. 12
         "restraint", "confinement", "removal from home", "preventing access to services",
         # New slang
-        "ghosting", "gaslighting", "breadcrumbing", "orbiting", "love bombing", "dry texting"
+        "ghosting", "gaslighting", "breadcrumbing", "orbiting", "love bombing", "dry texting",
         # Expanded
         "cut off from family", "no contact allowed", "can't see your friends", "blocked from social media",
         "forced to move", "not allowed to work", "kept at home", "monitored calls", "monitored texts",
@@ -36,7 +36,7 @@ ABUSE_INDICATORS = {
         # NDCC Ch. 12
         "verbal abuse", "emotional harm", "demeaning language",
         # New slang
-        "simp", "pick me", "trash", "clown", "salty", "flexing", "ratioed"
+        "simp", "pick me", "trash", "clown", "salty", "flexing", "ratioed",
         # Expanded
         "gaslight", "crazy-making", "you're imagining things", "no one believes you", "you're paranoid",
         "you're dramatic", "always your fault", "never good enough", "hopeless", "unlovable",
@@ -55,7 +55,7 @@ ABUSE_INDICATORS = {
         # NDCC Ch. 12
         "economic abuse", "financial exploitation", "fraud",
         # New slang
-        "sugar daddy", "venmo me", "cash app", "finesse", "scam"
+        "sugar daddy", "venmo me", "cash app", "finesse", "scam",
         # Expanded
         "can't have your own account", "no access to money", "forced to hand over paycheck",
         "not allowed to spend", "questioning every purchase", "financial punishment", "withholding necessities",
@@ -74,7 +74,7 @@ ABUSE_INDICATORS = {
         # NDCC Ch. 12
         "terrorizing", "menacing", "harassment", "intimidation",
         # New slang
-        "dox", "swat", "cancel", "expose", "leak", "drag"
+        "dox", "swat", "cancel", "expose", "leak", "drag",
         # Expanded
         "threaten to leave", "threaten to harm pets", "threaten to ruin career", "threaten to expose secrets",
         "threaten to call cps", "threaten to get custody", "threaten to hurt themselves", "threaten to hurt you",
@@ -91,7 +91,7 @@ ABUSE_INDICATORS = {
         # NDCC Ch. 12
         "sexual assault", "sexual exploitation", "non-consensual",
         # New slang
-        "thirst trap", "nudes", "sext", "slide into DMs", "catfish"
+        "thirst trap", "nudes", "sext", "slide into DMs", "catfish",
         # Expanded
         "pressured for sex", "forced to watch porn", "forced to perform acts", "withholding intimacy",
         "threaten to cheat", "threaten to leave if no sex", "forced pregnancy", "birth control sabotage",
@@ -108,10 +108,28 @@ ABUSE_INDICATORS = {
         # NDCC Ch. 12
         "electronic harassment", "digital impersonation", "online threats",
         # New slang
-        "finsta", "ghost account", "subtweet", "slide into DMs", "blockchain scam"
+        "finsta", "ghost account", "subtweet", "slide into DMs", "blockchain scam",
         # Expanded
         "forced to share passwords", "demanding access to phone", "installing tracking apps",
         "posting without consent", "threatening to leak nudes", "catfishing", "impersonating online",
         "spamming calls", "spamming messages", "public shaming online", "doxxing", "cyberbullying"
     ]
 }
+
+# Keywords are lowercased and deduplicated at build time; matching is case-insensitive.
+# Each category keeps its keywords in listed order, so scans and reports come
+# out the same on every run.
+ABUSE_INDICATORS = {
+    category: tuple(dict.fromkeys(map(str.lower, keywords)))
+    for category, keywords in _RAW_INDICATORS.items()
+}
+
+def _invert(indicators):
+    """Map each keyword to every category that lists it."""
+    categories = {}
+    for category, keywords in indicators.items():
+        for keyword in keywords:
+            categories.setdefault(keyword, []).append(category)
+    return {keyword: tuple(cats) for keyword, cats in categories.items()}
+
+KEYWORD_CATEGORIES = _invert(ABUSE_INDICATORS)
@@ -1,6 +1,11 @@
-import requirements.txt
-from typing import List, Dict, Any, Optional
-from difflib import SequenceMatcher
+from typing import List, Dict, Any, Optional, Tuple
+from rapidfuzz import fuzz, process
+
+# Minimum similarity (0-100) for a fuzzy keyword hit
+FUZZY_THRESHOLD = 85
+
+# Distinct texts remembered per engine before the score cache is emptied
+SCORE_CACHE_SIZE = 16384
 
 class AbusePatternEngine:
     """
@@ -9,55 +14,105 @@ class AbusePatternEngine:
     def __init__(self, indicators: Dict[str, List[str]], synonyms: Optional[Dict[str, List[str]]] = None):
         self.indicators = indicators
         self.synonyms = synonyms or {}
+        # Chat logs repeat short texts ("ok", "?") constantly, and the conversation
+        # path scores every message more than once, so score each distinct text once.
+        self._scores: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        # Flattened (category, keyword) pairs so a text is fuzzy-scored against
+        # every keyword in one C-level batch instead of one call per keyword.
+        self._keywords = [(category, kw) for category, keywords in indicators.items() for kw in keywords]
+        self._keyword_choices = [kw.lower() for _, kw in self._keywords]
+        # Each keyword's synonyms followed by the keyword itself, looked up once
+        # here so scoring a text never searches the synonym table.
+        self._match_terms = [(*self.synonyms.get(kw, ()), kw) for _, kw in self._keywords]
 
-    def fuzzy_match(self, text: str, keyword: str, threshold: float = 0.85) -> bool:
-        """Fuzzy match keyword in text using similarity threshold."""
-        return SequenceMatcher(None, text.lower(), keyword.lower()).ratio() >= threshold
+    def fuzzy_match(self, text: str, keyword: str, threshold: float = FUZZY_THRESHOLD / 100) -> bool:
+        """Fuzzy match keyword in text using similarity threshold (0-1)."""
+        return fuzz.ratio(text.lower(), keyword.lower(), score_cutoff=threshold * 100) > 0
 
     def synonym_match(self, text: str, keyword: str) -> bool:
         """Check if text matches keyword or any of its synonyms."""
+        text = text.lower()
         if keyword in self.synonyms:
             for syn in self.synonyms[keyword]:
-                if syn in text.lower():
+                if syn in text:
                     return True
-        return keyword in text.lower()
+        return keyword in text
+
+    def _score_text(self, text: str) -> Dict[str, Tuple[str, ...]]:
+        """Score lowercased text against every indicator, reusing earlier scores."""
+        scored = self._scores.get(text)
+        if scored is not None:
+            return scored
+        fuzzy_hits = {
+            index for _, _, index in process.extract(
+                text, self._keyword_choices, scorer=fuzz.ratio,
+                score_cutoff=FUZZY_THRESHOLD, limit=None
+            )
+        }
+        results = {}
+        for index, (category, kw) in enumerate(self._keywords):
+            if index in fuzzy_hits or any(term in text for term in self._match_terms[index]):
+                results.setdefault(category, []).append(kw)
+        scored = {category: tuple(kws) for category, kws in results.items()}
+        if len(self._scores) >= SCORE_CACHE_SIZE:
+            self._scores.clear()
+        self._scores[text] = scored
+        return scored
 
     def analyze_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze a single message for abuse patterns."""
-        results = {}
-        text = message.get('text', '').lower()
-        for category, keywords in self.indicators.items():
-            for kw in keywords:
-                if self.synonym_match(text, kw) or self.fuzzy_match(text, kw):
-                    results.setdefault(category, []).append(kw)
-        return results
+        scored = self._score_text(message.get('text', '').lower())
+        return {category: list(kws) for category, kws in scored.items()}
 
     def analyze_conversation(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze a list of messages for patterns, escalation, and cycles."""
+        # Score each message once and share the result with both detectors
+        per_msg = [self.analyze_message(m) for m in messages]
         pattern_results = {}
-        for msg in messages:
-            msg_patterns = self.analyze_message(msg)
+        for msg_patterns in per_msg:
             for cat, kws in msg_patterns.items():
                 pattern_results.setdefault(cat, []).extend(kws)
         # Detect escalation and cycles
-        pattern_results['escalation_detected'] = self.detect_escalation(messages)
-        pattern_results['cycle_detected'] = self.detect_cycle(messages)
+        pattern_results['escalation_detected'] = self.detect_escalation(messages, per_msg)
+        pattern_results['cycle_detected'] = self.detect_cycle(messages, per_msg)
         return pattern_results
 
-    def detect_escalation(self, messages: List[Dict[str, Any]]) -> bool:
-        """Detect escalation in abuse patterns over time."""
-        # Simple heuristic: increasing frequency or severity
-        abuse_counts = [len(self.analyze_message(m)) for m in messages]
-        return any(abuse_counts[i] < abuse_counts[i+1] for i in range(len(abuse_counts)-1))
+    def detect_escalation(self, messages: List[Dict[str, Any]],
+                          per_msg: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """Detect escalation in abuse patterns over time.
+
+        per_msg, if given, holds analyze_message() results for messages.
+        """
+        if per_msg is None:
+            per_msg = map(self.analyze_message, messages)
+        # Simple heuristic: increasing frequency or severity. Messages are
+        # scored lazily, so the walk stops at the first increase.
+        prev_count = None
+        for patterns in per_msg:
+            count = len(patterns)
+            if prev_count is not None and prev_count < count:
+                return True
+            prev_count = count
+        return False
 
-    def detect_cycle(self, messages: List[Dict[str, Any]]) -> bool:
-        """Detect repeated cycles of abuse patterns."""
+    def detect_cycle(self, messages: List[Dict[str, Any]],
+                     per_msg: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """Detect repeated cycles of abuse patterns.
+
+        per_msg, if given, holds analyze_message() results for messages.
+        """
+        if per_msg is None:
+            per_msg = map(self.analyze_message, messages)
         # Simple heuristic: repeated pattern categories in sequence
         last_cat = None
         cycle_count = 0
-        for m in messages:
-            cats = list(self.analyze_message(m).keys())
-            if cats and cats[0] == last_cat:
+        for patterns in per_msg:
+            first_cat = next(iter(patterns), None)
+            if first_cat is None:
+                continue
+            if first_cat == last_cat:
                 cycle_count += 1
-            last_cat = cats[0] if cats else last_cat
-        return cycle_count > 2
+                if cycle_count > 2:
+                    return True
+            last_cat = first_cat
+        return False
@@ -1,9 +1,16 @@
 import argparse
+import functools
 import sys
-import re
+from bisect import bisect_right
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Iterator, NamedTuple, Optional, Tuple
+import ahocorasick
+import numpy as np
 from pypdf import PdfReader
-from abuse_pattern_engine import AbusePatternEngine
-from abuse_indicators import ABUSE_INDICATORS
+from rapidfuzz import fuzz, process
+from abuse_pattern_engine import FUZZY_THRESHOLD, AbusePatternEngine
+from abuse_indicators import ABUSE_INDICATORS, KEYWORD_CATEGORIES
+from text_scan import on_word_boundary
 
 # Example synonym mapping (expand as needed)
 ABUSE_SYNONYMS = {
@@ -17,6 +24,118 @@ ABUSE_SYNONYMS = {
     # Add more synonyms/slang as needed
 }
 
+def _invert_synonyms(synonyms):
+    """Map each lowercased synonym to the lowercased keywords it stands for."""
+    parents = {}
+    for parent, syn_list in synonyms.items():
+        for syn in syn_list:
+            parents.setdefault(syn.lower(), []).append(parent.lower())
+    return {syn: tuple(keywords) for syn, keywords in parents.items()}
+
+SYNONYM_PARENTS = _invert_synonyms(ABUSE_SYNONYMS)
+
+def _build_keyword_automaton(keyword_categories, synonym_parents):
+    """
+    Builds one Aho-Corasick automaton over every indicator keyword and every
+    synonym so each message is scanned for all of them in a single pass.
+
+    Each word maps to (word, categories, synonym_categories): the categories
+    listing it as a keyword, and the categories of the keywords it is a
+    synonym of. A word can be both (e.g. "crazy-making").
+    """
+    automaton = ahocorasick.Automaton()
+    for word in keyword_categories.keys() | synonym_parents.keys():
+        categories = keyword_categories.get(word, ())
+        synonym_categories = tuple(dict.fromkeys(
+            category
+            for parent in synonym_parents.get(word, ())
+            for category in keyword_categories.get(parent, ())
+        ))
+        if categories or synonym_categories:
+            automaton.add_word(word, (word, categories, synonym_categories))
+    automaton.make_automaton()
+    return automaton
+
+# Category ids used by the columnar finding store in analyze_text
+CATEGORIES = tuple(ABUSE_INDICATORS)
+CATEGORY_IDS = {category: i for i, category in enumerate(CATEGORIES)}
+
+# Sort key for findings whose message has no usable timestamp
+MISSING_TIMESTAMP = float('-inf')
+
+class _ScanTables(NamedTuple):
+    """Everything analyze_text needs to scan for one selection of categories."""
+    automaton: Any
+    keyword_categories: Dict[str, Tuple[str, ...]]
+    # Fuzzy-scored keywords bucketed by length, so a text is only scored
+    # against the ones short enough to fit inside it
+    fuzzy_by_length: Tuple[str, ...]
+    fuzzy_lengths: List[int]
+    # Each fuzzy keyword's position in keyword_categories, to report hits in order
+    fuzzy_order: Dict[str, int]
+
+def _build_scan_tables(keyword_categories: Dict[str, Tuple[str, ...]]) -> _ScanTables:
+    # A window of len(keyword) that differs by one character scores (n-1)/n, so
+    # below this length the only fuzzy hits are the keyword embedded in a longer
+    # word, which the automaton already reports. Only longer keywords need scoring.
+    fuzzy_keywords = tuple(
+        kw for kw in keyword_categories if len(kw) >= 1 / (1 - FUZZY_THRESHOLD / 100)
+    )
+    fuzzy_by_length = tuple(sorted(fuzzy_keywords, key=len))
+    return _ScanTables(
+        automaton=_build_keyword_automaton(keyword_categories, SYNONYM_PARENTS),
+        keyword_categories=keyword_categories,
+        fuzzy_by_length=fuzzy_by_length,
+        fuzzy_lengths=[len(kw) for kw in fuzzy_by_length],
+        fuzzy_order={kw: i for i, kw in enumerate(fuzzy_keywords)},
+    )
+
+@functools.lru_cache(maxsize=None)
+def _scan_tables(categories: Optional[Tuple[str, ...]] = None) -> _ScanTables:
+    """
+    Returns scan tables specialized to the given categories, building them
+    on first use. None selects every category.
+    """
+    if categories is None:
+        return _build_scan_tables(KEYWORD_CATEGORIES)
+    unknown = set(categories) - set(CATEGORIES)
+    if unknown:
+        raise ValueError(f"Unknown categories: {', '.join(sorted(unknown))}")
+    keyword_categories = {}
+    for keyword, keyword_cats in KEYWORD_CATEGORIES.items():
+        selected = tuple(category for category in keyword_cats if category in categories)
+        if selected:
+            keyword_categories[keyword] = selected
+    return _build_scan_tables(keyword_categories)
+
+# Build the full tables at import so the first scan does not pay for them
+_scan_tables()
+
+def _first_fuzzy_window(keyword: str, text: str) -> Optional[int]:
+    """Start of the first len(keyword) window of text scoring at least FUZZY_THRESHOLD against keyword."""
+    size = len(keyword)
+    ratio = fuzz.ratio
+    for start in range(len(text) - size + 1):
+        if ratio(keyword, text[start:start + size], score_cutoff=FUZZY_THRESHOLD):
+            return start
+    return None
+
+def iter_pdf_pages(filepath: str) -> Iterator[Tuple[int, str]]:
+    """
+    Yields the text of a PDF one page at a time so the whole document is
+    never held in memory.
+
+    Args:
+        filepath (str): The path to the PDF file.
+
+    Returns:
+        Iterator of (page_number, page_text), numbered from 1.
+    """
+    # Pages share the reader's file stream, so they are decoded one at a time
+    reader = PdfReader(filepath)
+    for page_number, page in enumerate(reader.pages, 1):
+        yield page_number, page.extract_text() or ""
+
 def extract_text_from_pdf(filepath: str) -> str | None:
     """
     Extracts text from a PDF file.
@@ -28,123 +147,202 @@ def extract_text_from_pdf(filepath: str) -> str | None:
         str: The extracted text.
     """
     try:
-        reader = PdfReader(filepath)
-        text = ""
-        for page in reader.pages:
-            result = page.extract_text()
-            if result:
-                text += result + "\n"
-        return text
+        return "".join(text + "\n" for _, text in iter_pdf_pages(filepath) if text)
     except Exception as e:
         print(f"Error reading PDF file: {e}")
         return None
 
+_SMART_QUOTES = str.maketrans({'‘': "'", '’': "'", '“': '"', '”': '"'})
+
 def normalize_text(text: str) -> str:
     """
     Normalizes text by replacing smart quotes and other common characters
     that might interfere with matching.
     """
-    # Replace smart quotes with straight quotes
-    text = text.replace('‘', "'").replace('’', "'")
-    text = text.replace('“', '"').replace('”', '"')
-    return text
+    # Replace smart quotes with straight quotes in a single pass
+    return text.translate(_SMART_QUOTES)
+
+def _lowercase(text: str) -> str:
+    """
+    Lowercases text once for matching, keeping every character at its index
+    so match offsets can slice the original text for context.
+    """
+    lower_text = text.lower()
+    if len(lower_text) != len(text):
+        # 'İ' is the one character whose lowercase form is two code points
+        lower_text = text.replace('İ', 'I').lower()
+    return lower_text
 
-from typing import Dict, List, Any
-def analyze_text(messages: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+def _sort_key(timestamp: Any) -> Tuple[float, str]:
+    """
+    Chronological sort key for a message timestamp.
+
+    Returns:
+        Seconds since the epoch for a datetime, number or ISO string, paired
+        with ''. A missing timestamp gives (-inf, ''), and one that cannot be
+        parsed gives (-inf, the timestamp as a string), so those sort first
+        and keep their text order among themselves.
+    """
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp(), ''
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp), ''
+    if timestamp:
+        try:
+            return datetime.fromisoformat(str(timestamp)).timestamp(), ''
+        except ValueError:
+            return MISSING_TIMESTAMP, str(timestamp)
+    return MISSING_TIMESTAMP, ''
+
+def analyze_text(messages: List[Dict[str, Any]],
+                 categories: Optional[Iterable[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
     """
     Scans structured messages for abuse indicators, including sender, receiver, id, timestamp, and full message.
     Orders findings chronologically and includes placeholders for file, line, and page number.
+
+    Args:
+        messages (list): Message dicts with at least a 'text' key.
+        categories (iterable, optional): Only scan for these categories; all when None.
     """
-    from difflib import SequenceMatcher
+    tables = _scan_tables(tuple(sorted(set(categories))) if categories is not None else None)
     results = {}
     context_window = 40
-    findings = []
-    for msg in messages:
+    message_fields = []
+    # Findings are stored column-wise, one entry per finding, and only turned
+    # into dicts once they are sorted and grouped.
+    msg_col, category_col, type_col, start_col, end_col, indicator_col = [], [], [], [], [], []
+
+    # Bound methods looked up once; these run for every finding or message
+    add_msg, add_category, add_type = msg_col.append, category_col.append, type_col.append
+    add_start, add_end, add_indicator = start_col.append, end_col.append, indicator_col.append
+    add_fields = message_fields.append
+    category_ids = CATEGORY_IDS
+    scan = tables.automaton.iter
+    fuzzy_by_length, fuzzy_lengths = tables.fuzzy_by_length, tables.fuzzy_lengths
+    fuzzy_order = tables.fuzzy_order.__getitem__
+    extract, partial_ratio = process.extract, fuzz.partial_ratio
+
+    def record(index, category, word, finding_type, start, end):
+        add_msg(index)
+        add_category(category_ids[category])
+        add_type(finding_type)
+        add_start(start)
+        add_end(end)
+        add_indicator(word)
+
+    for index, msg in enumerate(messages):
         text = normalize_text(msg.get('text', ''))
-        lower_text = text.lower()
-        sender = msg.get('sender', 'Unknown')
-        receiver = msg.get('receiver', 'Unknown')
-        msg_id = msg.get('id', None)
-        timestamp = msg.get('timestamp', None)
-        file = msg.get('file', None)
-        line_number = msg.get('line_number', None)
-        page_number = msg.get('page_number', None)
-        for category, keywords in ABUSE_INDICATORS.items():
-            for keyword in keywords:
-                # Regex match
-                escaped_keyword = re.escape(keyword)
-                pattern = r'\b' + escaped_keyword + r'\b'
-                for match in re.finditer(pattern, text, re.IGNORECASE):
-                    findings.append({
-                        'category': category,
-                        'indicator': keyword,
-                        'type': 'exact',
-                        'context': text[max(0, match.start()-context_window):match.end()+context_window],
-                        'full_message': text,
-                        'sender': sender,
-                        'receiver': receiver,
-                        'id': msg_id,
-                        'timestamp': timestamp,
-                        'file': file,
-                        'line_number': line_number,
-                        'page_number': page_number
-                    })
-                # Fuzzy match
-                for i in range(len(lower_text) - len(keyword) + 1):
-                    window = lower_text[i:i+len(keyword)]
-                    if SequenceMatcher(None, window, keyword.lower()).ratio() > 0.85:
-                        findings.append({
-                            'category': category,
-                            'indicator': keyword,
-                            'type': 'fuzzy',
-                            'context': text[max(0, i-context_window):i+len(keyword)+context_window],
-                            'full_message': text,
-                            'sender': sender,
-                            'receiver': receiver,
-                            'id': msg_id,
-                            'timestamp': timestamp,
-                            'file': file,
-                            'line_number': line_number,
-                            'page_number': page_number
-                        })
-                        break
-                # Synonym match
-                for syn, syn_list in ABUSE_SYNONYMS.items():
-                    if keyword.lower() == syn.lower():
-                        for syn_kw in syn_list:
-                            syn_pattern = r'\b' + re.escape(syn_kw) + r'\b'
-                            for match in re.finditer(syn_pattern, text, re.IGNORECASE):
-                                findings.append({
-                                    'category': category,
-                                    'indicator': syn_kw,
-                                    'type': 'synonym',
-                                    'context': text[max(0, match.start()-context_window):match.end()+context_window],
-                                    'full_message': text,
-                                    'sender': sender,
-                                    'receiver': receiver,
-                                    'id': msg_id,
-                                    'timestamp': timestamp,
-                                    'file': file,
-                                    'line_number': line_number,
-                                    'page_number': page_number
-                                })
-    # Order findings chronologically if timestamp is present
-    findings.sort(key=lambda x: x.get('timestamp') or '')
-    # Group by category
-    for finding in findings:
-        results.setdefault(finding['category'], []).append(finding)
-    # Escalation: if multiple categories or many indicators found
-    escalation = False
-    if len(results) > 2 or sum(len(v) for v in results.values()) > 10:
-        escalation = True
-    results['escalation_detected'] = escalation
+        lower_text = _lowercase(text)
+        add_fields({
+            'full_message': text,
+            'sender': msg.get('sender', 'Unknown'),
+            'receiver': msg.get('receiver', 'Unknown'),
+            'id': msg.get('id', None),
+            'timestamp': msg.get('timestamp', None),
+            'file': msg.get('file', None),
+            'line_number': msg.get('line_number', None),
+            'page_number': msg.get('page_number', None)
+        })
+        exact_hits = set()
+        fuzzy_starts = {}
+        # One automaton pass covers every keyword and synonym
+        for last, (word, keyword_cats, synonym_cats) in scan(lower_text):
+            start, end = last - len(word) + 1, last + 1
+            if not on_word_boundary(lower_text, start, end):
+                # A keyword embedded in a longer word is a near match
+                if keyword_cats:
+                    fuzzy_starts.setdefault(word, start)
+                continue
+            if keyword_cats:
+                exact_hits.add(word)
+            for category in keyword_cats:
+                record(index, category, word, 'exact', start, end)
+            for category in synonym_cats:
+                record(index, category, word, 'synonym', start, end)
+        # Fuzzy match: first window of len(keyword) that scores high enough.
+        # partial_ratio also scores shorter windows at the edges of the text,
+        # so it is never below the best full-length score. Every keyword that
+        # fits is prefiltered with it in one C-level batch, and only the few
+        # hits have their full-length windows scored.
+        candidates = fuzzy_by_length[:bisect_right(fuzzy_lengths, len(lower_text))]
+        hits = extract(lower_text, candidates, scorer=partial_ratio,
+                       score_cutoff=FUZZY_THRESHOLD, limit=None)
+        for keyword in sorted((hit[0] for hit in hits), key=fuzzy_order):
+            if keyword in exact_hits or keyword in fuzzy_starts:
+                continue
+            start = _first_fuzzy_window(keyword, lower_text)
+            if start is not None:
+                fuzzy_starts[keyword] = start
+        for keyword, start in fuzzy_starts.items():
+            if keyword in exact_hits:
+                continue
+            for category in tables.keyword_categories[keyword]:
+                record(index, category, keyword, 'fuzzy', start, start + len(keyword))
+    if msg_col:
+        # Order findings chronologically; messages without a usable timestamp
+        # go first and ties keep scan order, since both sorts are stable.
+        epochs, unparsed = zip(*[_sort_key(fields['timestamp']) for fields in message_fields])
+        by_time = np.lexsort((np.array(unparsed), np.array(epochs)))
+        rank = np.empty(len(by_time), dtype=np.int32)
+        rank[by_time] = np.arange(len(by_time), dtype=np.int32)
+        order = np.argsort(rank[np.array(msg_col, dtype=np.int32)], kind='stable')
+        sorted_ids = np.array(category_col, dtype=np.int16)[order]
+        # Group by category, in order of first appearance
+        _, first_seen = np.unique(sorted_ids, return_index=True)
+        for position in np.sort(first_seen):
+            category_id = sorted_ids[position]
+            found_list = []
+            for finding in order[sorted_ids == category_id].tolist():
+                index, start, end = msg_col[finding], start_col[finding], end_col[finding]
+                found_list.append({
+                    'category': CATEGORIES[category_id],
+                    'indicator': indicator_col[finding],
+                    'type': type_col[finding],
+                    'context': message_fields[index]['full_message'][max(0, start-context_window):end+context_window],
+                    **message_fields[index]
+                })
+            results[CATEGORIES[category_id]] = found_list
+    results['escalation_detected'] = _escalation_detected(results)
     return results
 
-def analyze_text_advanced(text: str) -> Dict[str, Any]:
+def _escalation_detected(results: Dict[str, Any]) -> bool:
+    """Escalation: if multiple categories or many indicators found."""
+    found = [v for k, v in results.items() if k != 'escalation_detected']
+    return len(found) > 2 or sum(len(v) for v in found) > 10
+
+def merge_results(total: Dict[str, Any], results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merges one page's category dict into the running totals.
+
+    Args:
+        total (dict): Accumulated results, updated in place.
+        results (dict): Results for a single page.
+
+    Returns:
+        dict: The updated totals.
+    """
+    for category, found_list in results.items():
+        if category != 'escalation_detected':
+            total.setdefault(category, []).extend(found_list)
+    return total
+
+@functools.lru_cache(maxsize=None)
+def _advanced_engine(categories: Optional[Tuple[str, ...]] = None) -> AbusePatternEngine:
+    """
+    Returns the pattern engine for the given categories, building it on
+    first use so its score cache is shared across calls. None selects every
+    category.
+    """
+    indicators = ABUSE_INDICATORS
+    if categories is not None:
+        indicators = {category: ABUSE_INDICATORS[category] for category in categories}
+    return AbusePatternEngine(indicators, ABUSE_SYNONYMS)
+
+def analyze_text_advanced(text: str, categories: Optional[Iterable[str]] = None) -> Dict[str, Any]:
     """
     Advanced analysis using fuzzy matching, synonyms, and context-aware engine.
     """
-    engine = AbusePatternEngine(ABUSE_INDICATORS, ABUSE_SYNONYMS)
+    engine = _advanced_engine(None if categories is None else tuple(categories))
     # For PDF, treat as one message
     message = {"text": text}
     return engine.analyze_message(message)
@@ -180,18 +378,34 @@ def main():
     parser = argparse.ArgumentParser(description="Analyze a PDF for patterns of coercive control.")
     parser.add_argument("input_file", help="Path to the PDF file to analyze.")
     parser.add_argument("--advanced", action="store_true", help="Use advanced pattern engine.")
+    parser.add_argument("--categories", nargs="+", choices=CATEGORIES, metavar="CATEGORY",
+                        help="Only scan for these categories (default: all). Choices: %(choices)s.")
     args = parser.parse_args()
 
     print(f"Analyzing {args.input_file}...")
 
-    text = extract_text_from_pdf(args.input_file)
+    results = {}
+    found_text = False
+    try:
+        # Scan page by page; each page's text is dropped once analyzed
+        for page_number, page_text in iter_pdf_pages(args.input_file):
+            if not page_text:
+                continue
+            found_text = True
+            if args.advanced:
+                merge_results(results, analyze_text_advanced(page_text, args.categories))
+            else:
+                merge_results(results, analyze_text([{
+                    'text': page_text, 'file': args.input_file, 'page_number': page_number
+                }], args.categories))
+    except Exception as e:
+        print(f"Error reading PDF file: {e}")
 
-    if text:
+    if found_text:
         if args.advanced:
-            results = analyze_text_advanced(text)
             print("--- Advanced Abuse Pattern Engine Results ---\n")
         else:
-            results = analyze_text(text)
+            results['escalation_detected'] = _escalation_detected(results)
             print("--- Basic Abuse Pattern Analysis Results ---\n")
         print_results(results)
     else:
@@ -1,7 +1,10 @@
 """Enhanced CLI for coercive control analysis with Click."""
 
 import click
+import os
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from data_processor import DataProcessor
@@ -109,6 +112,78 @@ def analyze(input_file, platform, output, format, anonymize, verbose):
         sys.exit(1)
 
 
+def _process_one(filepath, output_dir, format, anonymize):
+    """
+    Analyze one file and write its report; runs in a batch worker process.
+
+    Args:
+        filepath: Path to the file to analyze
+        output_dir: Directory for the report
+        format: Report format
+        anonymize: Whether to anonymize conversation messages
+
+    Returns:
+        Dictionary with the file, report path and success flag
+    """
+    try:
+        processor = DataProcessor(filepath)
+        result = processor.process()
+
+        # Anonymize if requested
+        if anonymize:
+            anonymizer = DataAnonymizer()
+            if result.get('analysis_type') == 'conversation_analysis':
+                # Analysis results are cached and shared, so build anonymized
+                # copies instead of editing them in place
+                analysis = result.get('analysis', {})
+                abuse_patterns = {
+                    category: ({**data, 'messages': anonymizer.anonymize_conversation(data['messages'])}
+                               if 'messages' in data else data)
+                    for category, data in analysis.get('abuse_patterns', {}).items()
+                }
+                result = {**result, 'analysis': {**analysis, 'abuse_patterns': abuse_patterns}}
+
+        # Generate report
+        report_gen = ReportGenerator(output_dir)
+        filename = f"report_{Path(filepath).stem}.{format}"
+        report_path = report_gen.generate_report(result, format=format, output_filename=filename)
+
+        return {
+            'file': filepath,
+            'report': report_path,
+            'success': True
+        }
+
+    except Exception as e:
+        return {
+            'file': filepath,
+            'error': str(e),
+            'success': False
+        }
+
+
+def _echo_batch_results(jobs, total):
+    """
+    Report each batch result as it arrives.
+
+    Args:
+        jobs: Iterable of _process_one results, in input order
+        total: Number of input files
+
+    Returns:
+        List of the results
+    """
+    results = []
+    for i, result in enumerate(jobs, 1):
+        click.echo(f"[{i}/{total}] Processed: {result['file']}")
+        if result['success']:
+            click.echo(f"  ✓ Report saved: {result['report']}")
+        else:
+            click.secho(f"  ✗ Error: {result['error']}", fg='red')
+        results.append(result)
+    return results
+
+
 @cli.command()
 @click.argument('input_files', nargs=-1, type=click.Path(exists=True), required=True)
 @click.option('--output-dir', '-o', type=click.Path(), default='output',
@@ -123,44 +198,18 @@ def batch(input_files, output_dir, format, anonymize):
 
     click.echo(f"Processing {len(input_files)} files...")
 
-    results = []
-    for i, filepath in enumerate(input_files, 1):
-        try:
-            click.echo(f"[{i}/{len(input_files)}] Processing: {filepath}")
-
-            processor = DataProcessor(filepath)
-            result = processor.process()
-
-            # Anonymize if requested
-            if anonymize:
-                anonymizer = DataAnonymizer()
-                if result.get('analysis_type') == 'conversation_analysis':
-                    analysis = result.get('analysis', {})
-                    abuse_patterns = analysis.get('abuse_patterns', {})
-                    for category, data in abuse_patterns.items():
-                        if 'messages' in data:
-                            data['messages'] = anonymizer.anonymize_conversation(data['messages'])
-
-            # Generate report
-            report_gen = ReportGenerator(str(output_path))
-            filename = f"report_{Path(filepath).stem}.{format}"
-            report_path = report_gen.generate_report(result, format=format, output_filename=filename)
-
-            results.append({
-                'file': filepath,
-                'report': report_path,
-                'success': True
-            })
-
-            click.echo(f"  ✓ Report saved: {report_path}")
-
-        except Exception as e:
-            click.secho(f"  ✗ Error: {e}", fg='red')
-            results.append({
-                'file': filepath,
-                'error': str(e),
-                'success': False
-            })
+    # Files are independent, so each one is analyzed in its own process
+    job_args = (input_files,
+                [str(output_path)] * len(input_files),
+                [format] * len(input_files),
+                [anonymize] * len(input_files))
+    workers = min(len(input_files), os.cpu_count() or 1)
+    if workers < 2:
+        # One file or one CPU: a worker process would only add start-up time
+        results = _echo_batch_results(map(_process_one, *job_args), len(input_files))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = _echo_batch_results(executor.map(_process_one, *job_args), len(input_files))
 
     # Summary
     successful = sum(1 for r in results if r['success'])
@@ -244,21 +293,25 @@ def anonymize_file(input_file, output):
     try:
         from security.anonymization import DataAnonymizer
 
-        # Read file
-        with open(input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Anonymize
-        anonymizer = DataAnonymizer()
-        anonymized = anonymizer.anonymize_text(content)
-
         # Determine output path
         if not output:
             output = Path(input_file).with_suffix('.anonymized.txt')
 
-        # Write anonymized content
-        with open(output, 'w', encoding='utf-8') as f:
-            f.write(anonymized)
+        # Anonymize line by line so large logs are never held in memory. The
+        # lines go to a temporary file that replaces the output at the end,
+        # so an output path equal to the input does not truncate it mid-read.
+        anonymizer = DataAnonymizer()
+        output_dir = os.path.dirname(os.path.abspath(output))
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=output_dir,
+                                         suffix='.tmp', delete=False) as dst:
+            try:
+                with open(input_file, 'r', encoding='utf-8') as src:
+                    dst.writelines(anonymizer.anonymize_lines(src))
+            except BaseException:
+                dst.close()
+                os.unlink(dst.name)
+                raise
+        os.replace(dst.name, output)
 
         click.echo(f"✓ Anonymized file saved: {output}")
 
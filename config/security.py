@@ -1,21 +1,24 @@
 """Security configurations for handling sensitive data."""
 
 import os
+import threading
 from cryptography.fernet import Fernet
 
+from config.settings import env_flag
+
 # Encryption settings
 ENCRYPTION_KEY = os.getenv('ENCRYPTION_KEY')  # Should be set in environment
 DEFAULT_KEY_SIZE = 32  # bytes for AES-256
 
 # Data retention settings
 SECURE_DELETE_PASSES = int(os.getenv('SECURE_DELETE_PASSES', '3'))
-AUTO_DELETE_TEMP_FILES = os.getenv('AUTO_DELETE_TEMP_FILES', 'True').lower() == 'true'
+AUTO_DELETE_TEMP_FILES = env_flag('AUTO_DELETE_TEMP_FILES', True)
 
 # Anonymization settings
-ANONYMIZE_NAMES = os.getenv('ANONYMIZE_NAMES', 'True').lower() == 'true'
-ANONYMIZE_LOCATIONS = os.getenv('ANONYMIZE_LOCATIONS', 'True').lower() == 'true'
-ANONYMIZE_PHONE_NUMBERS = os.getenv('ANONYMIZE_PHONE_NUMBERS', 'True').lower() == 'true'
-ANONYMIZE_EMAILS = os.getenv('ANONYMIZE_EMAILS', 'True').lower() == 'true'
+ANONYMIZE_NAMES = env_flag('ANONYMIZE_NAMES', True)
+ANONYMIZE_LOCATIONS = env_flag('ANONYMIZE_LOCATIONS', True)
+ANONYMIZE_PHONE_NUMBERS = env_flag('ANONYMIZE_PHONE_NUMBERS', True)
+ANONYMIZE_EMAILS = env_flag('ANONYMIZE_EMAILS', True)
 
 # File security settings
 SECURE_FILE_PERMISSIONS = 0o600  # Owner read/write only
@@ -23,15 +26,15 @@ SECURE_DIR_PERMISSIONS = 0o700   # Owner read/write/execute only
 
 # Password/Key requirements
 MIN_PASSWORD_LENGTH = int(os.getenv('MIN_PASSWORD_LENGTH', '12'))
-REQUIRE_STRONG_PASSWORDS = os.getenv('REQUIRE_STRONG_PASSWORDS', 'True').lower() == 'true'
+REQUIRE_STRONG_PASSWORDS = env_flag('REQUIRE_STRONG_PASSWORDS', True)
 
 # Session settings
 SESSION_TIMEOUT_MINUTES = int(os.getenv('SESSION_TIMEOUT_MINUTES', '30'))
 MAX_LOGIN_ATTEMPTS = int(os.getenv('MAX_LOGIN_ATTEMPTS', '3'))
 
 # Privacy settings
-COLLECT_ANALYTICS = os.getenv('COLLECT_ANALYTICS', 'False').lower() == 'true'
-SHARE_ANONYMOUS_STATS = os.getenv('SHARE_ANONYMOUS_STATS', 'False').lower() == 'true'
+COLLECT_ANALYTICS = env_flag('COLLECT_ANALYTICS')
+SHARE_ANONYMOUS_STATS = env_flag('SHARE_ANONYMOUS_STATS')
 
 
 def generate_encryption_key():
@@ -39,9 +42,18 @@ def generate_encryption_key():
     return Fernet.generate_key()
 
 
+_generated_key = None
+_generated_key_lock = threading.Lock()
+
+
 def get_encryption_key():
     """Get or generate encryption key."""
+    global _generated_key
     if ENCRYPTION_KEY:
         return ENCRYPTION_KEY.encode()
-    # Generate a key if none exists (not recommended for production)
-    return generate_encryption_key()
+    # Generate a key if none exists (not recommended for production). It is
+    # generated once per process so every encryptor shares it.
+    with _generated_key_lock:
+        if _generated_key is None:
+            _generated_key = generate_encryption_key()
+        return _generated_key
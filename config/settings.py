@@ -3,6 +3,15 @@
 import os
 from pathlib import Path
 
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean setting from the environment ('true', any case, is True)."""
+    try:
+        return os.environ[name].lower() == 'true'
+    except KeyError:
+        return default
+
+
 # Base directory
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -14,10 +23,18 @@ TEMP_DIR = os.getenv('TEMP_DIR', BASE_DIR / 'temp')
 # Analysis settings
 DEFAULT_ANALYSIS_THRESHOLD = float(os.getenv('ANALYSIS_THRESHOLD', '0.5'))
 MAX_FILE_SIZE_MB = int(os.getenv('MAX_FILE_SIZE_MB', '100'))
+# PDF pages stop being extracted once this much text has been read
+MAX_PDF_TEXT_CHARS = int(os.getenv('MAX_PDF_TEXT_CHARS', str(MAX_FILE_SIZE_MB * 1024 * 512)))
 
 # Conversation analysis settings
 CONVERSATION_TIME_THRESHOLD_MINUTES = int(os.getenv('CONVERSATION_TIME_THRESHOLD', '60'))
 ESCALATION_WINDOW_DAYS = int(os.getenv('ESCALATION_WINDOW_DAYS', '7'))
+# Scan very large conversations in worker processes. Off by default, since
+# batch runs already analyze each file in its own process.
+PARALLEL_SCAN = env_flag('PARALLEL_SCAN')
+# Below this many messages a single-process scan finishes before worker
+# processes could start and build their own matchers
+PARALLEL_SCAN_THRESHOLD = int(os.getenv('PARALLEL_SCAN_THRESHOLD', '50000'))
 
 # Report settings
 REPORT_FORMATS = ['html', 'json', 'pdf', 'txt']
@@ -28,8 +45,8 @@ FIGURE_DPI = int(os.getenv('FIGURE_DPI', '300'))
 FIGURE_SIZE = (12, 8)
 
 # Security settings
-ENABLE_ENCRYPTION = os.getenv('ENABLE_ENCRYPTION', 'False').lower() == 'true'
-ENABLE_ANONYMIZATION = os.getenv('ENABLE_ANONYMIZATION', 'False').lower() == 'true'
+ENABLE_ENCRYPTION = env_flag('ENABLE_ENCRYPTION')
+ENABLE_ANONYMIZATION = env_flag('ENABLE_ANONYMIZATION')
 
 # Logging settings
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
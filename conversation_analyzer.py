@@ -1,42 +1,216 @@
 """Comprehensive conversation analysis module for detecting patterns of coercive control."""
 
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Tuple
 from collections import defaultdict, Counter
 import re
 
+import numpy as np
+
+try:
+    import ijson  # Optional: streaming JSON for platform detection
+except ImportError:
+    ijson = None
+
 from abuse_indicators import ABUSE_INDICATORS
-from parsers.whatsapp_parser import WhatsAppParser
-from parsers.sms_parser import SMSParser
-from parsers.discord_parser import DiscordParser
-from parsers.telegram_parser import TelegramParser
-from parsers.generic_text_parser import GenericTextParser
-from darvo_analyzer import DARVOAnalyzer
-from universal_import_handler import UniversalImportHandler
+from parallel import scan_workers, split_chunks
+from text_scan import KeywordMatcher
+
+
+class _KeywordScanner:
+    """Finds every indicator keyword, across all categories, in one pass."""
+
+    def __init__(self, indicators: Dict[str, List[str]], cues: Tuple[str, ...] = ()):
+        """
+        Build the matching structures for the indicator keywords.
+
+        Args:
+            indicators: Mapping of category to keywords
+            cues: Extra phrases matched in the same pass, where only whether
+                any of them occurs is reported
+        """
+        self.categories = tuple(indicators)
+        # Each distinct lowercased keyword, with the (category, keyword) pairs it reports
+        owners = {}
+        for category, keywords in indicators.items():
+            for keyword in keywords:
+                owners.setdefault(keyword.lower(), []).append((category, keyword))
+        for cue in cues:
+            owners.setdefault(cue.lower(), [])
+        self.words = tuple(owners)
+        self.owners = tuple(tuple(owners[word]) for word in self.words)
+        self.cue_ids = frozenset(self.words.index(cue.lower()) for cue in cues)
+        self._matcher = KeywordMatcher(self.words)
+
+    def _matched_ids_many(self, texts: List[str]) -> List[List[int]]:
+        """Ids of the keywords found in each text as whole words, each once per text."""
+        ids_per_text = [[] for _ in texts]
+        # Matches come in order of position, so each text's are consecutive
+        current = None
+        for text_index, word_id in self._matcher.scan(texts):
+            if text_index != current:
+                current = text_index
+                word_ids = ids_per_text[text_index]
+            if word_id not in word_ids:
+                word_ids.append(word_id)
+        return ids_per_text
+
+    def _group(self, word_ids: List[int]) -> Tuple[Dict[str, List[str]], bool]:
+        """Group matched keyword ids by category and note whether a cue occurred."""
+        by_category = {}
+        cued = False
+        for word_id in word_ids:
+            if word_id in self.cue_ids:
+                cued = True
+            for category, keyword in self.owners[word_id]:
+                by_category.setdefault(category, []).append(keyword)
+        if not by_category:
+            return by_category, cued
+        # Keep categories in indicator order
+        return {category: by_category[category] for category in self.categories
+                if category in by_category}, cued
+
+    def find(self, text: str) -> Tuple[Dict[str, List[str]], bool]:
+        """
+        Return the keywords found in text, grouped by category.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Tuple of a dictionary of category to matched keywords, each listed
+            once in order of occurrence with categories without matches
+            omitted, and whether any cue phrase occurs
+        """
+        # Media-only and system messages often carry no text at all
+        if not text:
+            return {}, False
+        return self.find_many([text])[0]
+
+    def find_many(self, texts: List[str]) -> List[Tuple[Dict[str, List[str]], bool]]:
+        """
+        Return what find would for each text, from a single scan of all of them.
+
+        Args:
+            texts: Texts to scan
+
+        Returns:
+            One (keywords by category, cued) tuple per text, as from find
+        """
+        return [self._group(word_ids) if word_ids else ({}, False)
+                for word_ids in self._matched_ids_many(texts)]
+
+
+@functools.lru_cache(maxsize=None)
+def _keyword_scanner() -> _KeywordScanner:
+    """
+    The keyword scanner shared by every analyzer instance.
+
+    Built on first use rather than at import, since compiling the Hyperscan
+    database takes a noticeable fraction of a second.
+    """
+    return _KeywordScanner(ABUSE_INDICATORS, COMMAND_PHRASES)
+
+
+@functools.lru_cache(maxsize=None)
+def _import_handler():
+    """
+    The UniversalImportHandler shared by every from_file call.
+
+    Sharing it keeps its loaded parsers across files, for example over a
+    DataProcessor batch. Parsers are only needed there, so they are imported
+    on first use.
+    """
+    from universal_import_handler import UniversalImportHandler
+    return UniversalImportHandler()
+
+
+# Imperative phrasing counted by analyze_power_dynamics, matched as whole
+# words in the same pass as the indicator keywords
+COMMAND_PHRASES = ("don't", 'stop', 'come', 'go', 'tell me', 'show me', 'give me')
+
+
+def _scan_chunk(texts: List[str]) -> List[Dict]:
+    """
+    Scan a run of message texts for keywords and imperative phrasing.
+
+    Top-level so ProcessPoolExecutor can pickle it for worker processes.
+
+    Args:
+        texts: Message texts to scan
+
+    Returns:
+        One dict per text with 'keywords' and 'command'
+    """
+    return [{'keywords': keywords, 'command': command}
+            for keywords, command in _keyword_scanner().find_many(texts)]
+
+
+def _memoized(method):
+    """
+    Cache an analysis method's result on the instance until the messages are
+    replaced or refresh() is called. Repeat calls return the same object, so
+    callers must treat results as read-only.
+    """
+    @functools.wraps(method)
+    def wrapper(self):
+        if method.__name__ not in self._cache:
+            self._cache[method.__name__] = method(self)
+        return self._cache[method.__name__]
+    return wrapper
 
 
 class ConversationAnalyzer:
     """Analyze conversation logs for patterns of coercive control."""
 
-    def __init__(self, messages: List[Dict]):
+    def __init__(self, messages: List[Dict], workers: Optional[int] = None):
         """
         Initialize the conversation analyzer.
 
         Args:
             messages: List of message dictionaries with keys:
                      timestamp, sender, text, platform
+            workers: Worker processes for scanning very large conversations;
+                     None follows the PARALLEL_SCAN setting, 1 keeps every
+                     scan in this process
         """
+        self.workers = workers
         # Example usage of message normalization
         try:
             from message_normalizer import normalize_messages
             messages = normalize_messages(messages)
         except ImportError:
             pass
-        self.messages = sorted(messages, key=lambda x: x.get('timestamp') or datetime.min)
+        # Parsers usually emit messages in order, so check before sorting;
+        # keys are extracted once and the sort stays stable
+        keys = [msg.get('timestamp') or datetime.min for msg in messages]
+        if all(earlier <= later for earlier, later in zip(keys, keys[1:])):
+            self.messages = list(messages)
+        else:
+            self.messages = [messages[i] for i in sorted(range(len(keys)), key=keys.__getitem__)]
         self.abuse_patterns = {}
         self.sender_stats = {}
         self.timeline_analysis = {}
 
+    @property
+    def messages(self) -> List[Dict]:
+        """The messages being analyzed, in time order."""
+        return self._messages
+
+    @messages.setter
+    def messages(self, messages: List[Dict]):
+        self._messages = messages
+        self._cache = {}
+
+    def refresh(self):
+        """
+        Drop cached analysis results. Call this after editing messages in
+        place; assigning a new list to messages does it automatically.
+        """
+        self._cache = {}
+
     @classmethod
     def from_file(cls, filepath: str, platform: Optional[str] = None):
         """
@@ -52,7 +226,7 @@ class ConversationAnalyzer:
             ConversationAnalyzer instance
         """
         # Use UniversalImportHandler for parsing
-        import_handler = UniversalImportHandler()
+        import_handler = _import_handler()
         
         try:
             # Parse file with universal handler
@@ -63,6 +237,12 @@ class ConversationAnalyzer:
             if platform is None:
                 platform = cls._detect_platform(filepath)
 
+            from parsers.whatsapp_parser import WhatsAppParser
+            from parsers.sms_parser import SMSParser
+            from parsers.discord_parser import DiscordParser
+            from parsers.telegram_parser import TelegramParser
+            from parsers.generic_text_parser import GenericTextParser
+
             parser_map = {
                 'whatsapp': WhatsAppParser,
                 'sms': SMSParser,
@@ -86,6 +266,8 @@ class ConversationAnalyzer:
         if filepath.endswith('.json'):
             # Try to determine if Discord or Telegram
             try:
+                if ijson:
+                    return ConversationAnalyzer._detect_json_platform(filepath)
                 import json
                 with open(filepath, 'r') as f:
                     data = json.load(f)
@@ -105,6 +287,53 @@ class ConversationAnalyzer:
             # Default to generic for .txt or other text files
             return 'generic'
 
+    @staticmethod
+    def _detect_json_platform(filepath: str) -> str:
+        """
+        Tell Telegram from Discord JSON by streaming only up to the end of the
+        first message, instead of parsing the whole export.
+        """
+        with open(filepath, 'rb') as f:
+            for prefix, event, value in ijson.parse(f):
+                if prefix == 'messages.item':
+                    # Telegram messages carry a 'from' field
+                    if event == 'map_key' and value == 'from':
+                        return 'telegram'
+                    if event in ('end_map', 'end_array'):
+                        return 'discord'
+                elif prefix == 'messages' and event == 'end_array':
+                    return 'discord'
+        return 'discord'
+
+    @_memoized
+    def _scan_once(self) -> List[Tuple[int, Dict]]:
+        """
+        Run every text scan the analyses need in a single pass over the messages.
+
+        Messages without text (media, stickers, calls) cannot match anything
+        and are left out, so no analysis has to step over them.
+
+        Returns:
+            (message index, scan) pairs for the messages with text, where
+            scan has 'keywords' ({category: [keyword, ...]}) and 'command'
+            (whether it contains imperative phrasing)
+        """
+        indexes = [i for i, msg in enumerate(self.messages) if msg.get('text')]
+        texts = [self.messages[i]['text'] for i in indexes]
+        workers = scan_workers(len(texts), self.workers)
+        if workers < 2:
+            return list(zip(indexes, _scan_chunk(texts)))
+
+        # Messages are independent, so contiguous chunks scanned in worker
+        # processes concatenate back into the same per-message list
+        chunks = [chunk for _, chunk in split_chunks(texts, workers)]
+        scans = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk_scans in executor.map(_scan_chunk, chunks):
+                scans.extend(chunk_scans)
+        return list(zip(indexes, scans))
+
+    @_memoized
     def analyze_abuse_patterns(self) -> Dict:
         """
         Scan messages for abuse indicators.
@@ -112,43 +341,51 @@ class ConversationAnalyzer:
         Returns:
             Dictionary of abuse patterns found
         """
-        self.abuse_patterns = {}
+        # Matches are collected column-wise: per category, the index of each
+        # matching message and the keyword. Per-message fields are looked up
+        # once when the report entries are built below.
+        columns = {category: ([], []) for category in ABUSE_INDICATORS}
+        for index, scan in self._scan_once():
+            for category, found in scan['keywords'].items():
+                indexes, keywords = columns[category]
+                indexes.extend([index] * len(found))
+                keywords.extend(found)
+        # Report categories in order of their first match, as before; for
+        # matches in the same message the stable sort keeps indicator order
+        columns = {category: columns[category] for category in
+                   sorted((c for c in columns if columns[c][0]), key=lambda c: columns[c][0][0])}
+
+        # A message with several hits shares one excerpt across all of them
+        excerpts = {}
+        for indexes, _ in columns.values():
+            for i in indexes:
+                if i not in excerpts:
+                    text = self.messages[i].get('text', '')
+                    excerpts[i] = text if len(text) <= 100 else text[:100] + '...'
 
-        for message in self.messages:
-            text = message.get('text', '')
-            sender = message.get('sender', 'Unknown')
-
-            # Analyze text for abuse indicators
-            for category, keywords in ABUSE_INDICATORS.items():
-                for keyword in keywords:
-                    pattern = r'\b' + re.escape(keyword) + r'\b'
-                    if re.search(pattern, text, re.IGNORECASE):
-                        if category not in self.abuse_patterns:
-                            self.abuse_patterns[category] = {
-                                'keywords': [],
-                                'count': 0,
-                                'senders': set(),
-                                'messages': []
-                            }
-
-                        self.abuse_patterns[category]['keywords'].append(keyword)
-                        self.abuse_patterns[category]['count'] += 1
-                        self.abuse_patterns[category]['senders'].add(sender)
-                        self.abuse_patterns[category]['messages'].append({
-                            'timestamp': message.get('timestamp'),
-                            'sender': sender,
-                            'text': text[:100] + '...' if len(text) > 100 else text,
-                            'keyword': keyword
-                        })
-
-        # Convert sets to lists for JSON serialization
-        for category in self.abuse_patterns:
-            self.abuse_patterns[category]['senders'] = list(
-                self.abuse_patterns[category]['senders']
-            )
+        self.abuse_patterns = {}
+        for category, (indexes, keywords) in columns.items():
+            senders = [self.messages[i].get('sender', 'Unknown') for i in indexes]
+            messages = []
+            for i, sender, keyword in zip(indexes, senders, keywords):
+                messages.append({
+                    'timestamp': self.messages[i].get('timestamp'),
+                    'sender': sender,
+                    'text': excerpts[i],
+                    'keyword': keyword
+                })
+            self.abuse_patterns[category] = {
+                'keywords': keywords,
+                'count': len(keywords),
+                'keyword_counts': dict(Counter(keywords)),
+                # Unique senders as a list for JSON serialization
+                'senders': list(dict.fromkeys(senders)),
+                'messages': messages
+            }
 
         return self.abuse_patterns
 
+    @_memoized
     def analyze_frequency_patterns(self) -> Dict:
         """
         Analyze message frequency and timing patterns.
@@ -162,20 +399,16 @@ class ConversationAnalyzer:
         # Count messages per sender
         sender_counts = Counter(msg['sender'] for msg in self.messages)
 
-        # Analyze time gaps between messages
-        time_gaps = []
-        for i in range(1, len(self.messages)):
-            if (self.messages[i].get('timestamp') and
-                    self.messages[i - 1].get('timestamp')):
-                gap = (self.messages[i]['timestamp'] -
-                       self.messages[i - 1]['timestamp']).total_seconds() / 60
-                time_gaps.append(gap)
+        # Analyze time gaps between consecutive messages that both have a
+        # timestamp; a missing one shows up as NaT and its gaps are dropped
+        gaps = np.diff(self._timestamps())
+        time_gaps = gaps[~np.isnat(gaps)] / np.timedelta64(1, 'm')
 
         # Calculate statistics
-        avg_gap = sum(time_gaps) / len(time_gaps) if time_gaps else 0
+        avg_gap = float(time_gaps.mean()) if time_gaps.size else 0
 
         # Identify rapid messaging patterns (potential harassment)
-        rapid_messages = sum(1 for gap in time_gaps if gap < 1)  # Less than 1 minute
+        rapid_messages = int((time_gaps < 1).sum())  # Less than 1 minute
 
         return {
             'total_messages': len(self.messages),
@@ -185,6 +418,7 @@ class ConversationAnalyzer:
             'time_span': self._calculate_time_span()
         }
 
+    @_memoized
     def analyze_escalation_patterns(self) -> Dict:
         """
         Detect escalation patterns in conversations.
@@ -197,23 +431,23 @@ class ConversationAnalyzer:
             return {'escalation_detected': False, 'details': []}
 
         window_size = timedelta(days=7)
-        current_window_start = self.messages[0]['timestamp']
+        first_timestamp = self.messages[0]['timestamp']
         window_counts = defaultdict(lambda: defaultdict(int))
 
-        for msg in self.messages:
+        for index, scan in self._scan_once():
+            msg = self.messages[index]
             if not msg.get('timestamp'):
                 continue
 
-            # Move window if needed
-            while msg['timestamp'] > current_window_start + window_size:
-                current_window_start += window_size
+            # Index of the window holding this message; a timestamp exactly
+            # on a window's end still belongs to that window
+            window = max(0, (msg['timestamp'] - first_timestamp - timedelta.resolution) // window_size)
 
             # Count abuse indicators in this window
-            text = msg.get('text', '')
             for category in ['Threats / Intimidation', 'Emotional Abuse / Degradation']:
-                for keyword in ABUSE_INDICATORS.get(category, []):
-                    if re.search(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE):
-                        window_counts[current_window_start][category] += 1
+                found = scan['keywords'].get(category)
+                if found:
+                    window_counts[window][category] += len(found)
 
         # Detect escalation (increasing counts over time)
         escalation_detected = False
@@ -236,6 +470,7 @@ class ConversationAnalyzer:
             'details': details
         }
 
+    @_memoized
     def analyze_isolation_tactics(self) -> Dict:
         """
         Analyze patterns indicating isolation tactics.
@@ -243,29 +478,32 @@ class ConversationAnalyzer:
         Returns:
             Dictionary with isolation analysis
         """
-        isolation_keywords = ABUSE_INDICATORS.get('Isolation', [])
         isolation_count = 0
         isolation_messages = []
 
-        for msg in self.messages:
-            text = msg.get('text', '')
-            for keyword in isolation_keywords:
-                if re.search(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE):
-                    isolation_count += 1
-                    isolation_messages.append({
-                        'timestamp': msg.get('timestamp'),
-                        'sender': msg.get('sender'),
-                        'keyword': keyword,
-                        'excerpt': text[:100]
-                    })
-                    break  # Count each message only once
+        for index, scan in self._scan_once():
+            # The shared scan already found every isolation keyword; the first
+            # one stands for the message, which is counted only once
+            found = scan['keywords'].get('Isolation')
+            if not found:
+                continue
+            isolation_count += 1
+            if len(isolation_messages) < 5:  # Show up to 5 examples
+                msg = self.messages[index]
+                isolation_messages.append({
+                    'timestamp': msg.get('timestamp'),
+                    'sender': msg.get('sender'),
+                    'keyword': found[0],
+                    'excerpt': msg.get('text', '')[:100]
+                })
 
         return {
             'isolation_indicators_found': isolation_count,
             'severity': 'high' if isolation_count > 10 else 'medium' if isolation_count > 5 else 'low',
-            'sample_messages': isolation_messages[:5]  # Show up to 5 examples
+            'sample_messages': isolation_messages
         }
 
+    @_memoized
     def analyze_power_dynamics(self) -> Dict:
         """
         Analyze power dynamics through communication patterns.
@@ -282,23 +520,20 @@ class ConversationAnalyzer:
         })
 
         for msg in self.messages:
-            sender = msg.get('sender', 'Unknown')
+            stats = sender_stats[msg.get('sender', 'Unknown')]
             text = msg.get('text', '')
 
-            sender_stats[sender]['message_count'] += 1
-            sender_stats[sender]['total_length'] += len(text)
+            stats['message_count'] += 1
+            stats['total_length'] += len(text)
 
             # Count questions
             if '?' in text:
-                sender_stats[sender]['question_count'] += 1
+                stats['question_count'] += 1
 
-            # Detect commands (imperative sentences)
-            command_patterns = [
-                r'\bdon\'t\b', r'\bstop\b', r'\bcome\b', r'\bgo\b',
-                r'\btell me\b', r'\bshow me\b', r'\bgive me\b'
-            ]
-            if any(re.search(p, text, re.IGNORECASE) for p in command_patterns):
-                sender_stats[sender]['command_count'] += 1
+        # Detect commands (imperative sentences)
+        for index, scan in self._scan_once():
+            if scan['command']:
+                sender_stats[self.messages[index].get('sender', 'Unknown')]['command_count'] += 1
 
         # Calculate averages
         for sender in sender_stats:
@@ -312,6 +547,27 @@ class ConversationAnalyzer:
             'imbalance_detected': self._detect_power_imbalance(sender_stats)
         }
 
+    @_memoized
+    def _timestamps(self) -> np.ndarray:
+        """
+        Message timestamps as one datetime64 array, converted once and shared
+        by the time-based analyses.
+
+        Returns:
+            Array aligned with self.messages, NaT where a timestamp is missing
+        """
+        return np.array([self._as_datetime64(msg.get('timestamp')) for msg in self.messages],
+                        dtype='datetime64[us]')
+
+    @staticmethod
+    def _as_datetime64(timestamp) -> np.datetime64:
+        """Convert a message timestamp to naive UTC datetime64; NaT if missing."""
+        if not timestamp:
+            return np.datetime64('NaT')
+        if getattr(timestamp, 'tzinfo', None) is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return np.datetime64(timestamp, 'us')
+
     def _detect_power_imbalance(self, sender_stats: Dict) -> bool:
         """Detect if there's a significant power imbalance."""
         if len(sender_stats) < 2:
@@ -330,12 +586,15 @@ class ConversationAnalyzer:
         if not self.messages:
             return {}
 
-        timestamped = [m for m in self.messages if m.get('timestamp')]
-        if not timestamped:
+        timestamps = self._timestamps()
+        timestamped = np.flatnonzero(~np.isnat(timestamps))
+        if not timestamped.size:
             return {}
 
-        start = min(m['timestamp'] for m in timestamped)
-        end = max(m['timestamp'] for m in timestamped)
+        # Locate the extremes on the array, then report the original objects
+        # so timezone offsets survive in the ISO strings
+        start = self.messages[timestamped[timestamps[timestamped].argmin()]]['timestamp']
+        end = self.messages[timestamped[timestamps[timestamped].argmax()]]['timestamp']
         duration = end - start
 
         return {
@@ -344,6 +603,7 @@ class ConversationAnalyzer:
             'duration_days': duration.days
         }
 
+    @_memoized
     def analyze_darvo_tactics(self) -> Dict:
         """
         Analyze DARVO (Deny, Attack, Reverse Victim/Offender) manipulation tactics.
@@ -351,9 +611,12 @@ class ConversationAnalyzer:
         Returns:
             Dictionary with DARVO analysis results
         """
-        darvo_analyzer = DARVOAnalyzer(messages=self.messages)
+        from darvo_analyzer import DARVOAnalyzer
+
+        darvo_analyzer = DARVOAnalyzer(messages=self.messages, workers=self.workers)
         return darvo_analyzer.analyze_darvo_patterns()
 
+    @_memoized
     def generate_summary(self) -> Dict:
         """
         Generate a comprehensive summary of all analyses.
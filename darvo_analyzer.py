@@ -7,34 +7,175 @@ Victim and Offender) manipulation tactics in communications and documents.
 
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
-from collections import defaultdict, Counter
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import functools
 import re
 
+import numpy as np
+import pandas as pd
+
 from darvo_indicators import (
     DARVO_INDICATORS,
     DARVO_COMPOUND_PATTERNS,
     DARVO_SEVERITY_WEIGHTS,
     CHILD_FOCUSED_DARVO
 )
+from parallel import scan_workers, split_chunks
+from parsers._common import _interned
+from text_scan import KeywordMatcher
+
+
+# Every table a message is classified against, child-focused patterns included
+_CLASSIFICATION_TABLES = dict(DARVO_INDICATORS, Child_Focused=CHILD_FOCUSED_DARVO)
+
+
+def _keyword_owners(tables: Dict[str, Dict[str, List[str]]]) -> Tuple[Tuple[str, ...], Tuple[tuple, ...]]:
+    """
+    List every distinct keyword of every table with the places it is listed.
+
+    A keyword listed in several places maps to all of them, so one match
+    reports each (category, subcategory) it belongs to.
+
+    Args:
+        tables: Mapping of category to {subcategory: keywords}
+
+    Returns:
+        Tuple of the lowercased keywords and, for each, its owners: a tuple
+        of (category, subcategory, position in keyword list, keyword)
+    """
+    owners = {}
+    for category, subcategories in tables.items():
+        for subcategory, keywords in subcategories.items():
+            for position, keyword in enumerate(keywords):
+                owners.setdefault(keyword.lower(), []).append((category, subcategory, position, keyword))
+    return tuple(owners), tuple(tuple(word_owners) for word_owners in owners.values())
+
+
+# Built once at import and shared by every analyzer
+_KEYWORDS, _KEYWORD_OWNERS = _keyword_owners(_CLASSIFICATION_TABLES)
+
+# Severity weight of each subcategory, in table order; child-focused
+# patterns always score 5
+_SEVERITY_WEIGHT_VECTORS = {
+    category: np.array([DARVO_SEVERITY_WEIGHTS[category][subcategory] if category in DARVO_SEVERITY_WEIGHTS else 5
+                        for subcategory in subcategories], dtype=np.int64)
+    for category, subcategories in _CLASSIFICATION_TABLES.items()
+}
+
+# Severity assessment key of each scored category
+_SCORED_CATEGORIES = (
+    ("deny", "Deny"),
+    ("attack", "Attack"),
+    ("reverse", "Reverse_Victim_Offender"),
+    ("institutional", "Institutional_DARVO"),
+    ("child_focused", "Child_Focused")
+)
+
+def _week_keys(timestamps) -> List[str]:
+    """
+    Label each timestamp with the Monday of its week as 'YYYY-MM-DD'.
+
+    Timestamps pandas cannot hold in one column (such as mixed timezones)
+    are labelled one by one instead.
+
+    Args:
+        timestamps: Sequence of datetime objects
+
+    Returns:
+        Week label for each timestamp, in order
+    """
+    try:
+        stamps = pd.Series(pd.to_datetime(list(timestamps)))
+    except (TypeError, ValueError):
+        return [(ts - timedelta(days=ts.weekday())).strftime('%Y-%m-%d') for ts in timestamps]
+    week_starts = stamps.dt.normalize() - pd.to_timedelta(stamps.dt.weekday, unit='D')
+    return list(week_starts.dt.strftime('%Y-%m-%d'))
+
+
+@functools.lru_cache(maxsize=None)
+def _keyword_matcher() -> KeywordMatcher:
+    """
+    The DARVO keyword matcher shared by every analyzer.
+
+    Built on first use rather than at import, since compiling the Hyperscan
+    database takes a noticeable fraction of a second.
+    """
+    return KeywordMatcher(_KEYWORDS)
+
+
+def _classify_texts(texts: List[str]) -> Tuple[List[Dict[str, Dict[str, str]]], Dict[int, str],
+                                                Dict[str, Dict[str, List[int]]]]:
+    """
+    Classify message texts against every DARVO table.
+
+    Top-level so ProcessPoolExecutor can pickle it for worker processes.
+
+    Args:
+        texts: Message texts, as written
+
+    Returns:
+        Tuple of the per-message classification ({category: {subcategory:
+        first matching keyword}}), the excerpt of each text with a match by
+        index, and per category and subcategory the indexes of the texts
+        that matched it
+    """
+    classified = [None] * len(texts)
+    snippets = {}
+    # Per category and subcategory, the indexes of the texts it matched
+    hits = {category: {subcategory: [] for subcategory in subcategories}
+            for category, subcategories in _CLASSIFICATION_TABLES.items()}
+    current = None
+    for msg_index, word_id in _keyword_matcher().scan(texts):
+        owners = _KEYWORD_OWNERS[word_id]
+        if msg_index != current:
+            current = msg_index
+            matches = classified[msg_index] = {category: {} for category in _CLASSIFICATION_TABLES}
+            # Every instance reported for this text shares one excerpt
+            snippets[msg_index] = texts[msg_index][:200]
+            # List position of each recorded keyword, per (category, subcategory)
+            positions = {}
+        # Keep the earliest-listed keyword of each subcategory
+        for category, subcategory, position, keyword in owners:
+            best = positions.get((category, subcategory))
+            if best is None:
+                hits[category][subcategory].append(msg_index)
+            if best is None or position < best:
+                positions[(category, subcategory)] = position
+                matches[category][subcategory] = keyword
+
+    for msg_index, matches in enumerate(classified):
+        if matches is None:
+            classified[msg_index] = {category: {} for category in _CLASSIFICATION_TABLES}
+    return classified, snippets, hits
 
 
 class DARVOAnalyzer:
     """Analyzer for detecting DARVO manipulation tactics."""
 
-    def __init__(self, messages: Optional[List[Dict]] = None, text: Optional[str] = None):
+    def __init__(self, messages: Optional[List[Dict]] = None, text: Optional[str] = None,
+                 workers: Optional[int] = None):
         """
         Initialize DARVO analyzer.
 
         Args:
             messages: List of message dictionaries (for conversation analysis)
             text: Plain text string (for document analysis)
+            workers: Worker processes for classifying very large
+                conversations; None follows the PARALLEL_SCAN setting
         """
+        self.workers = workers
         self.messages = messages or []
         self.text = text or ""
         self.darvo_patterns = {}
         self.severity_score = 0
         self.timeline_events = []
         self.compound_patterns_found = []
+        self._classified = None
+        self._classified_source = None
+        self._snippets = {}
+        self._iso_timestamps = {}
+        self._hits = {}
         
     def analyze_darvo_patterns(self) -> Dict:
         """
@@ -111,153 +252,174 @@ class DARVOAnalyzer:
         
         return self._analyze_conversation()
 
+    def _classify_all(self) -> List[Dict[str, Dict[str, str]]]:
+        """
+        Classify every message against every DARVO table in one pass.
+
+        The result is cached and shared by all detectors, scoring, timeline
+        and summary, so each message is scanned once no matter how many
+        analyses look at it. It is rebuilt if self.messages is replaced.
+        Alongside it, self._snippets and self._iso_timestamps map each
+        message with a match to the excerpt and ISO timestamp its instances
+        report, and self._hits lists, per category and subcategory, the
+        indexes of the messages that matched it.
+
+        Returns:
+            One dict per message mapping each category (the DARVO_INDICATORS
+            keys and 'Child_Focused') to {subcategory: first matching keyword}
+            for the subcategories that matched
+        """
+        if self._classified is None or self._classified_source is not self.messages:
+            texts = [msg.get('text', '') for msg in self.messages]
+            # Conversations repeat short messages; classify each distinct
+            # text once and share its result with every copy
+            distinct = {}
+            text_ids = [distinct.setdefault(text, len(distinct)) for text in texts]
+            distinct_texts = list(distinct)
+            workers = scan_workers(len(distinct_texts), self.workers)
+            if workers < 2:
+                classified, snippets, hits = _classify_texts(distinct_texts)
+            else:
+                classified, snippets, hits = self._classify_in_parallel(distinct_texts, workers)
+            if len(distinct_texts) < len(texts):
+                classified, snippets, hits = self._expand_distinct(text_ids, classified, snippets, hits)
+            self._classified = classified
+            self._snippets = snippets
+            # Serialize each matching message's timestamp once, however many
+            # instances report it
+            self._iso_timestamps = {}
+            for index in snippets:
+                timestamp = self.messages[index].get('timestamp')
+                self._iso_timestamps[index] = timestamp.isoformat() if timestamp else None
+            self._hits = hits
+            self._classified_source = self.messages
+        return self._classified
+
+    @staticmethod
+    def _expand_distinct(text_ids: List[int], classified: List[Dict[str, Dict[str, str]]],
+                         snippets: Dict[int, str],
+                         hits: Dict[str, Dict[str, List[int]]]) -> Tuple[List[Dict[str, Dict[str, str]]],
+                                                                        Dict[int, str],
+                                                                        Dict[str, Dict[str, List[int]]]]:
+        """
+        Map the classification of distinct texts back onto every message.
+
+        Args:
+            text_ids: Index of each message's text among the distinct texts
+            classified: Classification of each distinct text
+            snippets: Excerpt of each distinct text with a match
+            hits: Per category and subcategory, the distinct texts that matched
+
+        Returns:
+            The same three results indexed by message
+        """
+        occurrences = [[] for _ in classified]
+        for msg_index, text_id in enumerate(text_ids):
+            occurrences[text_id].append(msg_index)
+        message_hits = {
+            category: {
+                subcategory: sorted(msg_index for text_id in text_indexes for msg_index in occurrences[text_id])
+                for subcategory, text_indexes in subcategories.items()
+            }
+            for category, subcategories in hits.items()
+        }
+        message_snippets = {msg_index: snippets[text_id] for msg_index, text_id in enumerate(text_ids)
+                            if text_id in snippets}
+        return [classified[text_id] for text_id in text_ids], message_snippets, message_hits
+
+    @staticmethod
+    def _classify_in_parallel(texts: List[str], workers: int) -> Tuple[List[Dict[str, Dict[str, str]]],
+                                                                       Dict[int, str],
+                                                                       Dict[str, Dict[str, List[int]]]]:
+        """
+        Classify contiguous chunks of the texts in worker processes and merge
+        the results, shifting chunk-local indexes to message indexes.
+
+        Compound, timeline and scoring steps stay serial since they read the
+        merged classification, so no chunk overlap is needed.
+
+        Args:
+            texts: Message texts, as written
+            workers: Number of worker processes
+
+        Returns:
+            Same as _classify_texts for the full list
+        """
+        chunk_starts, chunk_texts = zip(*split_chunks(texts, workers))
+        classified = []
+        snippets = {}
+        hits = {category: {subcategory: [] for subcategory in subcategories}
+                for category, subcategories in _CLASSIFICATION_TABLES.items()}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = executor.map(_classify_texts, chunk_texts)
+            for start, (chunk_classified, chunk_snippets, chunk_hits) in zip(chunk_starts, chunks):
+                classified.extend(chunk_classified)
+                snippets.update((start + index, snippet) for index, snippet in chunk_snippets.items())
+                for category, subcategories in chunk_hits.items():
+                    for subcategory, indexes in subcategories.items():
+                        hits[category][subcategory].extend(start + index for index in indexes)
+        return classified, snippets, hits
+
+    def _category_results(self, category: str, severities: Dict[str, int], **extra) -> Dict:
+        """
+        Build the per-subcategory counts and instances of one category.
+
+        Instance fields are gathered column by column from the shared hit
+        indexes and only zipped into the reported dicts at the end.
+
+        Args:
+            category: Classification category (a DARVO_INDICATORS key or
+                'Child_Focused')
+            severities: Severity reported for each subcategory
+            **extra: Further fields added to every instance
+
+        Returns:
+            Dictionary of subcategory to {"count", "instances"}
+        """
+        classified = self._classify_all()
+        results = {}
+        for subcategory, indexes in self._hits[category].items():
+            keywords = [classified[index][category][subcategory] for index in indexes]
+            snippets = [self._snippets[index] for index in indexes]
+            # Sender names repeat across a conversation; intern them so every
+            # instance from the same sender shares one string
+            senders = [_interned(self.messages[index].get('sender', 'Unknown')) for index in indexes]
+            timestamps = [self._iso_timestamps[index] for index in indexes]
+            severity = severities[subcategory]
+            results[subcategory] = {
+                "count": len(indexes),
+                "instances": [{
+                    "keyword": keyword,
+                    "text": snippet,
+                    "sender": sender,
+                    "timestamp": timestamp,
+                    "severity": severity,
+                    **extra
+                } for keyword, snippet, sender, timestamp in zip(keywords, snippets, senders, timestamps)]
+            }
+        return results
+
     def _detect_deny_patterns(self) -> Dict:
         """Detect denial patterns in messages."""
-        deny_results = {
-            "minimization": {"count": 0, "instances": []},
-            "outright_denial": {"count": 0, "instances": []},
-            "blame_shifting": {"count": 0, "instances": []}
-        }
-        
-        for msg in self.messages:
-            text = msg.get('text', '').lower()
-            timestamp = msg.get('timestamp')
-            sender = msg.get('sender', 'Unknown')
-            
-            for subcategory, keywords in DARVO_INDICATORS["Deny"].items():
-                for keyword in keywords:
-                    pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-                    if re.search(pattern, text):
-                        deny_results[subcategory]["count"] += 1
-                        deny_results[subcategory]["instances"].append({
-                            "keyword": keyword,
-                            "text": msg.get('text', '')[:200],
-                            "sender": sender,
-                            "timestamp": timestamp.isoformat() if timestamp else None,
-                            "severity": DARVO_SEVERITY_WEIGHTS["Deny"][subcategory]
-                        })
-                        break  # Count each message once per subcategory
-        
-        return deny_results
+        return self._category_results("Deny", DARVO_SEVERITY_WEIGHTS["Deny"])
 
     def _detect_attack_patterns(self) -> Dict:
         """Detect attack patterns in messages."""
-        attack_results = {
-            "credibility_attacks": {"count": 0, "instances": []},
-            "character_assassination": {"count": 0, "instances": []},
-            "threat_of_consequences": {"count": 0, "instances": []},
-            "gaslighting": {"count": 0, "instances": []}
-        }
-        
-        for msg in self.messages:
-            text = msg.get('text', '').lower()
-            timestamp = msg.get('timestamp')
-            sender = msg.get('sender', 'Unknown')
-            
-            for subcategory, keywords in DARVO_INDICATORS["Attack"].items():
-                for keyword in keywords:
-                    pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-                    if re.search(pattern, text):
-                        attack_results[subcategory]["count"] += 1
-                        attack_results[subcategory]["instances"].append({
-                            "keyword": keyword,
-                            "text": msg.get('text', '')[:200],
-                            "sender": sender,
-                            "timestamp": timestamp.isoformat() if timestamp else None,
-                            "severity": DARVO_SEVERITY_WEIGHTS["Attack"][subcategory]
-                        })
-                        break
-        
-        return attack_results
+        return self._category_results("Attack", DARVO_SEVERITY_WEIGHTS["Attack"])
 
     def _detect_reverse_patterns(self) -> Dict:
         """Detect victim/offender reversal patterns."""
-        reverse_results = {
-            "self_victimization": {"count": 0, "instances": []},
-            "victim_blaming": {"count": 0, "instances": []},
-            "false_equivalence": {"count": 0, "instances": []},
-            "protective_parent_reversal": {"count": 0, "instances": []}
-        }
-        
-        for msg in self.messages:
-            text = msg.get('text', '').lower()
-            timestamp = msg.get('timestamp')
-            sender = msg.get('sender', 'Unknown')
-            
-            for subcategory, keywords in DARVO_INDICATORS["Reverse_Victim_Offender"].items():
-                for keyword in keywords:
-                    pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-                    if re.search(pattern, text):
-                        reverse_results[subcategory]["count"] += 1
-                        reverse_results[subcategory]["instances"].append({
-                            "keyword": keyword,
-                            "text": msg.get('text', '')[:200],
-                            "sender": sender,
-                            "timestamp": timestamp.isoformat() if timestamp else None,
-                            "severity": DARVO_SEVERITY_WEIGHTS["Reverse_Victim_Offender"][subcategory]
-                        })
-                        break
-        
-        return reverse_results
+        return self._category_results("Reverse_Victim_Offender",
+                                      DARVO_SEVERITY_WEIGHTS["Reverse_Victim_Offender"])
 
     def _detect_institutional_patterns(self) -> Dict:
         """Detect institutional/legal DARVO patterns."""
-        institutional_results = {
-            "court_manipulation": {"count": 0, "instances": []},
-            "professional_credibility": {"count": 0, "instances": []},
-            "systemic_bias_indicators": {"count": 0, "instances": []}
-        }
-        
-        for msg in self.messages:
-            text = msg.get('text', '').lower()
-            timestamp = msg.get('timestamp')
-            sender = msg.get('sender', 'Unknown')
-            
-            for subcategory, keywords in DARVO_INDICATORS["Institutional_DARVO"].items():
-                for keyword in keywords:
-                    pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-                    if re.search(pattern, text):
-                        institutional_results[subcategory]["count"] += 1
-                        institutional_results[subcategory]["instances"].append({
-                            "keyword": keyword,
-                            "text": msg.get('text', '')[:200],
-                            "sender": sender,
-                            "timestamp": timestamp.isoformat() if timestamp else None,
-                            "severity": DARVO_SEVERITY_WEIGHTS["Institutional_DARVO"][subcategory]
-                        })
-                        break
-        
-        return institutional_results
+        return self._category_results("Institutional_DARVO", DARVO_SEVERITY_WEIGHTS["Institutional_DARVO"])
 
     def _detect_child_focused_patterns(self) -> Dict:
         """Detect child-focused DARVO patterns (high priority)."""
-        child_results = {
-            "child_weaponization": {"count": 0, "instances": []},
-            "parental_alienation_claims": {"count": 0, "instances": []},
-            "custody_threats": {"count": 0, "instances": []}
-        }
-        
-        for msg in self.messages:
-            text = msg.get('text', '').lower()
-            timestamp = msg.get('timestamp')
-            sender = msg.get('sender', 'Unknown')
-            
-            for subcategory, keywords in CHILD_FOCUSED_DARVO.items():
-                for keyword in keywords:
-                    pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-                    if re.search(pattern, text):
-                        child_results[subcategory]["count"] += 1
-                        child_results[subcategory]["instances"].append({
-                            "keyword": keyword,
-                            "text": msg.get('text', '')[:200],
-                            "sender": sender,
-                            "timestamp": timestamp.isoformat() if timestamp else None,
-                            "severity": 5,  # Child-related patterns always high severity
-                            "high_risk": True
-                        })
-                        break
-        
-        return child_results
+        # Child-related patterns always high severity
+        return self._category_results("Child_Focused", dict.fromkeys(CHILD_FOCUSED_DARVO, 5), high_risk=True)
 
     def _detect_compound_patterns(self) -> List[Dict]:
         """
@@ -271,69 +433,67 @@ class DARVOAnalyzer:
         if len(self.messages) < 2:
             return compound_patterns
         
-        # Classify each message
-        message_classifications = []
-        for msg in self.messages:
-            text = msg.get('text', '').lower()
-            classifications = []
-            
-            # Check for deny
-            if any(re.search(r'\b' + re.escape(kw.lower()) + r'\b', text) 
-                   for subcat in DARVO_INDICATORS["Deny"].values() 
-                   for kw in subcat):
-                classifications.append('deny')
-            
-            # Check for attack
-            if any(re.search(r'\b' + re.escape(kw.lower()) + r'\b', text) 
-                   for subcat in DARVO_INDICATORS["Attack"].values() 
-                   for kw in subcat):
-                classifications.append('attack')
-            
-            # Check for reverse
-            if any(re.search(r'\b' + re.escape(kw.lower()) + r'\b', text) 
-                   for subcat in DARVO_INDICATORS["Reverse_Victim_Offender"].values() 
-                   for kw in subcat):
-                classifications.append('reverse')
-            
-            message_classifications.append({
-                'classifications': classifications,
-                'message': msg
-            })
+        # Messages carrying each DARVO component
+        classified = self._classify_all()
+        component_categories = {
+            'deny': "Deny",
+            'attack': "Attack",
+            'reverse': "Reverse_Victim_Offender"
+        }
+        has_component = {
+            component: [bool(matches[category]) for matches in classified]
+            for component, category in component_categories.items()
+        }
+        has_any = [any(flags) for flags in zip(*has_component.values())]
+
+        # next_index[component][i]: first message at or after i carrying the
+        # component, or len(messages); lets each window be checked in a few
+        # jumps instead of a walk over every message in it
+        message_count = len(self.messages)
+        next_index = {}
+        for component, flags in has_component.items():
+            following = [message_count] * (message_count + 1)
+            for i in range(message_count - 1, -1, -1):
+                following[i] = i if flags[i] else following[i + 1]
+            next_index[component] = following
         
         # Look for compound patterns
         for pattern_name, pattern_def in DARVO_COMPOUND_PATTERNS.items():
             window_size = pattern_def["window_messages"]
             target_pattern = pattern_def["pattern"]
             
-            for i in range(len(message_classifications) - len(target_pattern) + 1):
-                window = message_classifications[i:i + window_size]
+            first_index = next_index[target_pattern[0]]
+            last_start = message_count - len(target_pattern)
+            i = 0
+            while i <= last_start:
+                window_end = min(i + window_size, message_count)
                 
-                # Check if pattern appears in window
-                pattern_found = self._check_pattern_in_window(window, target_pattern)
-                
-                if pattern_found:
+                # Match the components in order, each in a later message than
+                # the one before, all within the window
+                position = i
+                for component in target_pattern:
+                    position = next_index[component][position]
+                    if position >= window_end:
+                        break
+                    position += 1
+                else:
+                    window = self.messages[i:window_end]
                     compound_patterns.append({
                         "pattern_type": pattern_name,
                         "description": pattern_def["description"],
-                        "messages": [w['message'] for w in window if w['classifications']],
+                        "messages": [msg for msg, flagged in zip(window, has_any[i:window_end]) if flagged],
                         "severity": len(target_pattern) * 2,  # Higher severity for compound patterns
-                        "start_time": window[0]['message'].get('timestamp'),
-                        "end_time": window[-1]['message'].get('timestamp')
+                        "start_time": window[0].get('timestamp'),
+                        "end_time": window[-1].get('timestamp')
                     })
+                    i += 1
+                    continue
+                # Windows ending before the next occurrence of the first
+                # component cannot match either, so skip straight past them
+                i = max(i + 1, first_index[i] - window_size + 1)
         
         return compound_patterns
 
-    def _check_pattern_in_window(self, window: List[Dict], target_pattern: List[str]) -> bool:
-        """Check if a target pattern sequence appears in a message window."""
-        pattern_index = 0
-        
-        for msg_class in window:
-            if pattern_index < len(target_pattern):
-                if target_pattern[pattern_index] in msg_class['classifications']:
-                    pattern_index += 1
-        
-        return pattern_index == len(target_pattern)
-
     def _calculate_severity(self) -> Dict:
         """
         Calculate overall DARVO severity score.
@@ -341,62 +501,15 @@ class DARVOAnalyzer:
         Returns:
             Dictionary with severity assessment
         """
-        total_score = 0
-        category_scores = {
-            "deny": 0,
-            "attack": 0,
-            "reverse": 0,
-            "institutional": 0,
-            "child_focused": 0
-        }
-        
-        # Calculate from detected patterns
-        for msg in self.messages:
-            text = msg.get('text', '').lower()
-            
-            # Score denial patterns
-            for subcat, keywords in DARVO_INDICATORS["Deny"].items():
-                for keyword in keywords:
-                    if re.search(r'\b' + re.escape(keyword.lower()) + r'\b', text):
-                        score = DARVO_SEVERITY_WEIGHTS["Deny"][subcat]
-                        category_scores["deny"] += score
-                        total_score += score
-                        break
-            
-            # Score attack patterns
-            for subcat, keywords in DARVO_INDICATORS["Attack"].items():
-                for keyword in keywords:
-                    if re.search(r'\b' + re.escape(keyword.lower()) + r'\b', text):
-                        score = DARVO_SEVERITY_WEIGHTS["Attack"][subcat]
-                        category_scores["attack"] += score
-                        total_score += score
-                        break
-            
-            # Score reverse patterns
-            for subcat, keywords in DARVO_INDICATORS["Reverse_Victim_Offender"].items():
-                for keyword in keywords:
-                    if re.search(r'\b' + re.escape(keyword.lower()) + r'\b', text):
-                        score = DARVO_SEVERITY_WEIGHTS["Reverse_Victim_Offender"][subcat]
-                        category_scores["reverse"] += score
-                        total_score += score
-                        break
-            
-            # Score institutional patterns
-            for subcat, keywords in DARVO_INDICATORS["Institutional_DARVO"].items():
-                for keyword in keywords:
-                    if re.search(r'\b' + re.escape(keyword.lower()) + r'\b', text):
-                        score = DARVO_SEVERITY_WEIGHTS["Institutional_DARVO"][subcat]
-                        category_scores["institutional"] += score
-                        total_score += score
-                        break
-            
-            # Score child-focused patterns (always severity 5)
-            for keywords in CHILD_FOCUSED_DARVO.values():
-                for keyword in keywords:
-                    if re.search(r'\b' + re.escape(keyword.lower()) + r'\b', text):
-                        category_scores["child_focused"] += 5
-                        total_score += 5
-                        break
+        # Each subcategory scores its weight once per matching message, so a
+        # category's score is its hit counts dotted with its weights
+        self._classify_all()
+        category_scores = {}
+        for name, category in _SCORED_CATEGORIES:
+            counts = np.fromiter((len(indexes) for indexes in self._hits[category].values()),
+                                 dtype=np.int64, count=len(self._hits[category]))
+            category_scores[name] = int(counts @ _SEVERITY_WEIGHT_VECTORS[category])
+        total_score = sum(category_scores.values())
         
         # Determine risk level
         risk_level = "low"
@@ -433,57 +546,80 @@ class DARVOAnalyzer:
         if not self.messages or not any(m.get('timestamp') for m in self.messages):
             return {"timeline_available": False}
         
-        # Group patterns by time windows
-        time_windows = defaultdict(lambda: {
-            "deny_count": 0,
-            "attack_count": 0,
-            "reverse_count": 0,
-            "total_score": 0
+        # Flag each timestamped message with a pattern, then sum the flags
+        # per weekly window; weeks without any pattern are not reported
+        classified = self._classify_all()
+        rows = [(msg['timestamp'], bool(flags["Deny"]), bool(flags["Attack"]),
+                 bool(flags["Reverse_Victim_Offender"]))
+                for msg, flags in zip(self.messages, classified)
+                if msg.get('timestamp') and (flags["Deny"] or flags["Attack"] or flags["Reverse_Victim_Offender"])]
+        if len(rows) < 2:
+            # Nothing to group or compare, as always for a document, which is
+            # analyzed as a single message
+            time_windows = {}
+            for timestamp, deny, attack, reverse in rows:
+                week_key = (timestamp - timedelta(days=timestamp.weekday())).strftime('%Y-%m-%d')
+                time_windows[week_key] = {
+                    "deny_count": int(deny),
+                    "attack_count": int(attack),
+                    "reverse_count": int(reverse),
+                    "total_score": 0
+                }
+            return {
+                "timeline_available": True,
+                "time_windows": time_windows,
+                "escalation_detected": False,
+                "total_weeks": len(time_windows)
+            }
+        
+        timestamps, deny, attack, reverse = zip(*rows)
+        frame = pd.DataFrame({
+            "week": _week_keys(timestamps),
+            "deny_count": pd.Series(deny, dtype=bool),
+            "attack_count": pd.Series(attack, dtype=bool),
+            "reverse_count": pd.Series(reverse, dtype=bool)
         })
+        weekly = frame.groupby("week", sort=False).sum()
+        weekly["total_score"] = 0
         
-        for msg in self.messages:
-            if not msg.get('timestamp'):
-                continue
-            
-            # Use weekly windows
-            timestamp = msg.get('timestamp')
-            week_start = timestamp - timedelta(days=timestamp.weekday())
-            week_key = week_start.strftime('%Y-%m-%d')
-            
-            text = msg.get('text', '').lower()
-            
-            # Count patterns in this window
-            if any(re.search(r'\b' + re.escape(kw.lower()) + r'\b', text) 
-                   for subcat in DARVO_INDICATORS["Deny"].values() for kw in subcat):
-                time_windows[week_key]["deny_count"] += 1
-            
-            if any(re.search(r'\b' + re.escape(kw.lower()) + r'\b', text) 
-                   for subcat in DARVO_INDICATORS["Attack"].values() for kw in subcat):
-                time_windows[week_key]["attack_count"] += 1
-            
-            if any(re.search(r'\b' + re.escape(kw.lower()) + r'\b', text) 
-                   for subcat in DARVO_INDICATORS["Reverse_Victim_Offender"].values() for kw in subcat):
-                time_windows[week_key]["reverse_count"] += 1
+        time_windows = {
+            week: {name: int(count) for name, count in counts.items()}
+            for week, counts in weekly.to_dict(orient="index").items()
+        }
         
         # Detect escalation
-        sorted_weeks = sorted(time_windows.keys())
+        weekly = weekly.sort_index()
         escalation_detected = False
         
-        if len(sorted_weeks) >= 2:
-            early_counts = time_windows[sorted_weeks[0]]
-            late_counts = time_windows[sorted_weeks[-1]]
-            early_total = early_counts["deny_count"] + early_counts["attack_count"] + early_counts["reverse_count"]
-            late_total = late_counts["deny_count"] + late_counts["attack_count"] + late_counts["reverse_count"]
-            if late_total > early_total * 1.5:
+        if len(weekly) >= 2:
+            window_totals = weekly[["deny_count", "attack_count", "reverse_count"]].sum(axis=1)
+            if window_totals.iloc[-1] > window_totals.iloc[0] * 1.5:
                 escalation_detected = True
         
         return {
             "timeline_available": True,
-            "time_windows": dict(time_windows),
+            "time_windows": time_windows,
             "escalation_detected": escalation_detected,
-            "total_weeks": len(sorted_weeks)
+            "total_weeks": len(weekly)
         }
 
+    def _category_mask(self, category: str) -> np.ndarray:
+        """
+        Mark the messages with at least one match in a category.
+
+        Args:
+            category: Classification category (a DARVO_INDICATORS key or
+                'Child_Focused')
+
+        Returns:
+            Boolean array with one entry per message
+        """
+        self._classify_all()
+        mask = np.zeros(len(self.messages), dtype=bool)
+        for indexes in self._hits[category].values():
+            mask[indexes] = True
+        return mask
+
     def _generate_forensic_summary(self) -> Dict:
         """
         Generate forensic summary suitable for legal documentation.
@@ -492,50 +628,10 @@ class DARVOAnalyzer:
             Dictionary with court-ready summary
         """
         # Count total message instances (not keyword occurrences)
-        messages_with_deny = set()
-        messages_with_attack = set()
-        messages_with_reverse = set()
-        messages_with_child = set()
-        
-        for i, msg in enumerate(self.messages):
-            text = msg.get('text', '').lower()
-            
-            # Check for deny patterns
-            if any(
-                re.search(r'\b' + re.escape(kw.lower()) + r'\b', text)
-                for keywords in DARVO_INDICATORS["Deny"].values()
-                for kw in keywords
-            ):
-                messages_with_deny.add(i)
-            
-            # Check for attack patterns
-            if any(
-                re.search(r'\b' + re.escape(kw.lower()) + r'\b', text)
-                for keywords in DARVO_INDICATORS["Attack"].values()
-                for kw in keywords
-            ):
-                messages_with_attack.add(i)
-            
-            # Check for reverse patterns
-            if any(
-                re.search(r'\b' + re.escape(kw.lower()) + r'\b', text)
-                for keywords in DARVO_INDICATORS["Reverse_Victim_Offender"].values()
-                for kw in keywords
-            ):
-                messages_with_reverse.add(i)
-            
-            # Check for child-focused patterns
-            if any(
-                re.search(r'\b' + re.escape(kw.lower()) + r'\b', text)
-                for keywords in CHILD_FOCUSED_DARVO.values()
-                for kw in keywords
-            ):
-                messages_with_child.add(i)
-        
-        total_deny = len(messages_with_deny)
-        total_attack = len(messages_with_attack)
-        total_reverse = len(messages_with_reverse)
-        total_child_focused = len(messages_with_child)
+        total_deny = int(self._category_mask("Deny").sum())
+        total_attack = int(self._category_mask("Attack").sum())
+        total_reverse = int(self._category_mask("Reverse_Victim_Offender").sum())
+        total_child_focused = int(self._category_mask("Child_Focused").sum())
         
         # Determine if full DARVO pattern present
         full_pattern_present = total_deny > 0 and total_attack > 0 and total_reverse > 0
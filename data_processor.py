@@ -1,24 +1,124 @@
 """Unified data processing pipeline for multiple input formats."""
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import json
+import mmap
+import os
 
-from pypdf import PdfReader
-from analyze import normalize_text, analyze_text
-from conversation_analyzer import ConversationAnalyzer
+from exports import to_json_bytes
 from config.settings import (
     SUPPORTED_PDF_EXTENSIONS,
     SUPPORTED_TEXT_EXTENSIONS,
     SUPPORTED_JSON_EXTENSIONS,
     SUPPORTED_CSV_EXTENSIONS,
-    MAX_FILE_SIZE_MB
+    MAX_FILE_SIZE_MB,
+    MAX_PDF_TEXT_CHARS
 )
 
 
+@lru_cache(maxsize=128)
+def _extract_pdf_text(path: str, mtime_ns: int, size: int) -> Tuple[str, int, bool]:
+    """
+    Extract the text of a PDF, once per version of the file.
+
+    The modification time and size are only part of the cache key, so an
+    edited file is extracted again. Extraction stops at the first page that
+    takes the text past MAX_PDF_TEXT_CHARS.
+
+    Args:
+        path: Path to the PDF file
+        mtime_ns: File modification time in nanoseconds
+        size: File size in bytes
+
+    Returns:
+        Tuple of the extracted text, the number of pages and whether pages
+        were left unread
+    """
+    # Imported here so callers that never open a PDF skip loading pypdf
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    page_count = len(reader.pages)
+    # Join once at the end; growing one string page by page copies it again
+    # for every page
+    parts = []
+    length = 0
+    truncated = False
+    for page_number, page in enumerate(reader.pages, 1):
+        part = page.extract_text()
+        if not part:
+            continue
+        parts.append(part)
+        length += len(part) + 1
+        if length > MAX_PDF_TEXT_CHARS and page_number < page_count:
+            truncated = True
+            break
+    text = "\n".join(parts) + ("\n" if parts else "")
+    return text, page_count, truncated
+
+
+@lru_cache(maxsize=128)
+def _read_text_file(path: str, mtime_ns: int, size: int) -> str:
+    """
+    Read a UTF-8 text file, once per version of the file.
+
+    Args:
+        path: Path to the text file
+        mtime_ns: File modification time in nanoseconds
+        size: File size in bytes
+
+    Returns:
+        File content, with line endings translated as text mode would
+    """
+    if not size:
+        return ""
+    # Decode straight from the page cache instead of first copying the
+    # whole file into a bytes object
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        text = str(data, 'utf-8')
+        has_carriage_returns = data.find(b'\r') != -1
+    if has_carriage_returns:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _process_file(filepath: str) -> Dict:
+    """
+    Process one file for process_batch, reporting failure as a result.
+
+    Top-level so ProcessPoolExecutor can pickle it for worker processes.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        Analysis results, or a dictionary describing the error
+    """
+    try:
+        return DataProcessor(filepath).process()
+    except Exception as e:
+        return {
+            'filepath': filepath,
+            'error': str(e),
+            'success': False
+        }
+
+
 class DataProcessor:
     """Unified data processor for handling multiple input formats."""
 
+    # Method that processes each data type; conversation handlers also take
+    # the platform
+    _PROCESSORS = {
+        'pdf': '_process_pdf',
+        'text': '_process_conversation',
+        'json': '_process_conversation',
+        'csv': '_process_conversation',
+    }
+
     def __init__(self, filepath: str):
         """
         Initialize the data processor.
@@ -77,25 +177,16 @@ class DataProcessor:
         Returns:
             Dictionary containing processed data and analysis
         """
-            # Import message normalization
-            try:
-                from message_normalizer import normalize_messages
-            except ImportError:
-                normalize_messages = lambda x: x
-
-            if self.data_type == 'pdf':
-                return self._process_pdf()
-            elif self.data_type in ['text', 'json', 'csv']:
-                messages = self._parse_messages()
-                messages = normalize_messages(messages)
-                analyzer = ConversationAnalyzer(messages)
-                self.processed_data = {
-                    'analysis_type': 'conversation_analysis',
-                    'filepath': str(self.filepath),
-                    'analysis': analyzer.analyze(),
-                }
-            else:
-                raise ValueError(f"Unsupported file type: {self.file_extension}")
+        handler = self._PROCESSORS.get(self.data_type)
+        if handler is None:
+            raise ValueError(f"Unsupported file type: {self.file_extension}")
+
+        process_file = getattr(self, handler)
+        if handler == '_process_conversation':
+            self.processed_data = process_file(platform)
+        else:
+            self.processed_data = process_file()
+        return self.processed_data
 
     def _process_pdf(self) -> Dict:
         """
@@ -104,27 +195,33 @@ class DataProcessor:
         Returns:
             Dictionary with PDF analysis results
         """
+        # The keyword analysis (and pypdf behind it) loads on first use
+        from analyze import normalize_text, analyze_text
+
         # Extract text from PDF
         try:
-            reader = PdfReader(str(self.filepath))
-            text = ""
-            for page in reader.pages:
-                result = page.extract_text()
-                if result:
-                    text += result + "\n"
+            text, page_count, truncated = _extract_pdf_text(*self._cache_key())
 
             if not text:
                 raise ValueError("No text could be extracted from PDF")
 
             # Normalize and analyze text
             normalized_text = normalize_text(text)
-            analysis_results = analyze_text(normalized_text)
+            findings = analyze_text([{'text': normalized_text}])
+            # Reports and exports list each category's matched keywords, one
+            # per finding; a single message has no escalation to report
+            findings.pop('escalation_detected', None)
+            analysis_results = {
+                category: [finding['indicator'] for finding in category_findings]
+                for category, category_findings in findings.items()
+            }
 
             return {
                 'file_type': 'pdf',
                 'filepath': str(self.filepath),
-                'total_pages': len(reader.pages),
+                'total_pages': page_count,
                 'text_length': len(text),
+                'truncated': truncated,
                 'abuse_patterns': analysis_results,
                 'analysis_type': 'document_analysis'
             }
@@ -142,6 +239,8 @@ class DataProcessor:
         Returns:
             Dictionary with conversation analysis results
         """
+        from conversation_analyzer import ConversationAnalyzer
+
         try:
             # Create conversation analyzer
             analyzer = ConversationAnalyzer.from_file(
@@ -174,43 +273,40 @@ class DataProcessor:
         Returns:
             List of analysis results
         """
-        results = []
-        for filepath in filepaths:
-            try:
-                processor = DataProcessor(filepath)
-                result = processor.process()
-                results.append(result)
-            except Exception as e:
-                results.append({
-                    'filepath': filepath,
-                    'error': str(e),
-                    'success': False
-                })
-
-        return results
-
-    def get_text_content(self) -> str:
+        # Files are independent, so spread them over worker processes;
+        # results keep the order of filepaths
+        workers = min(os.cpu_count() or 1, len(filepaths))
+        if workers < 2:
+            return [_process_file(filepath) for filepath in filepaths]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_process_file, filepaths))
+
+    def _cache_key(self) -> Tuple[str, int, int]:
+        """Path, modification time and size identifying this version of the file."""
+        stat = self.filepath.stat()
+        return str(self.filepath), stat.st_mtime_ns, stat.st_size
+
+    def get_text_content(self, pretty_json: bool = False) -> str:
         """
         Get raw text content from the file.
 
+        Args:
+            pretty_json: Parse JSON files and return them re-indented by two
+                spaces instead of as written
+
         Returns:
             Extracted text content
         """
         if self.data_type == 'pdf':
-            reader = PdfReader(str(self.filepath))
-            text = ""
-            for page in reader.pages:
-                result = page.extract_text()
-                if result:
-                    text += result + "\n"
+            text, _, _ = _extract_pdf_text(*self._cache_key())
             return text
         elif self.data_type == 'text':
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                return f.read()
+            return _read_text_file(*self._cache_key())
         elif self.data_type == 'json':
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return json.dumps(data, indent=2)
+            text = _read_text_file(*self._cache_key())
+            if pretty_json:
+                return json.dumps(json.loads(text), indent=2)
+            return text
         else:
             return ""
 
@@ -227,8 +323,8 @@ class DataProcessor:
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         if format == 'json':
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, default=str)
+            with open(output_path, 'wb') as f:
+                f.write(to_json_bytes(results))
         elif format == 'txt':
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(self._format_results_as_text(results))
@@ -6,6 +6,38 @@ from pathlib import Path
 from typing import Dict, Optional
 from datetime import datetime
 
+try:
+    import orjson  # Optional: C-accelerated JSON serialization
+except ImportError:
+    orjson = None
+
+
+def to_json_bytes(data) -> bytes:
+    """
+    Serialize data as UTF-8 JSON indented by two spaces.
+
+    Values JSON cannot represent, datetimes included, are written as str(),
+    as json.dumps(default=str) would.
+
+    Args:
+        data: Data to serialize
+
+    Returns:
+        Encoded JSON document
+    """
+    if orjson:
+        try:
+            return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                                | orjson.OPT_PASSTHROUGH_DATETIME)
+        except orjson.JSONEncodeError:
+            # Such as integers wider than 64 bits; the standard library copes
+            pass
+    return json.dumps(data, indent=2, default=str).encode('utf-8')
+
+
+# Columns of a CSV export; document analyses only fill the first two
+CSV_FIELDNAMES = ('category', 'keyword', 'timestamp', 'sender', 'text_excerpt')
+
 
 class Exporter:
     """Export analysis results to various formats."""
@@ -49,14 +81,15 @@ class Exporter:
 
     def _export_json(self, data: Dict, output_path: Path) -> str:
         """Export to JSON format."""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, default=str)
+        with open(output_path, 'wb') as f:
+            f.write(to_json_bytes(data))
         return str(output_path)
 
     def _export_csv(self, data: Dict, output_path: Path) -> str:
         """Export to CSV format."""
-        # Flatten data for CSV
+        # Flatten data for CSV, as tuples in CSV_FIELDNAMES order
         rows = []
+        fieldnames = CSV_FIELDNAMES
 
         if data.get('analysis_type') == 'conversation_analysis':
             analysis = data.get('analysis', {})
@@ -64,35 +97,26 @@ class Exporter:
 
             for category, pattern_data in abuse_patterns.items():
                 messages = pattern_data.get('messages', [])
-                for msg in messages:
-                    rows.append({
-                        'category': category,
-                        'keyword': msg.get('keyword', ''),
-                        'timestamp': msg.get('timestamp', ''),
-                        'sender': msg.get('sender', ''),
-                        'text_excerpt': msg.get('text', '')
-                    })
+                rows.extend((
+                    category,
+                    msg.get('keyword', ''),
+                    msg.get('timestamp', ''),
+                    msg.get('sender', ''),
+                    msg.get('text', '')
+                ) for msg in messages)
 
         elif data.get('analysis_type') == 'document_analysis':
             abuse_patterns = data.get('abuse_patterns', {})
             for category, keywords in abuse_patterns.items():
-                for keyword in keywords:
-                    rows.append({
-                        'category': category,
-                        'keyword': keyword
-                    })
-
-        if rows:
-            fieldnames = rows[0].keys()
-            with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(rows)
-        else:
-            # Create empty CSV with headers
-            with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['category', 'keyword', 'timestamp', 'sender', 'text_excerpt'])
+                rows.extend((category, keyword) for keyword in keywords)
+            if rows:
+                fieldnames = CSV_FIELDNAMES[:2]
+
+        # Without rows, the file still gets the full header
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(rows)
 
         return str(output_path)
 
@@ -106,7 +130,7 @@ class Exporter:
         lines.append("")
 
         # Add JSON representation
-        lines.append(json.dumps(data, indent=2, default=str))
+        lines.append(to_json_bytes(data).decode('utf-8'))
 
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write('\n'.join(lines))
@@ -1,10 +1,105 @@
 """Universal file upload handler with platform detection and validation."""
 
 import os
-from pathlib import Path
-from typing import Optional, Dict, List, Tuple
+import stat
+from typing import Optional, Dict, List, NamedTuple, Tuple
 from universal_import_handler import UniversalImportHandler
 
+_SUPPORTED_PLATFORMS = (
+    {
+        'id': 'whatsapp',
+        'name': 'WhatsApp',
+        'description': 'WhatsApp chat export (.txt)',
+        'extensions': ['.txt']
+    },
+    {
+        'id': 'sms',
+        'name': 'SMS',
+        'description': 'SMS backup (XML or CSV)',
+        'extensions': ['.xml', '.csv']
+    },
+    {
+        'id': 'discord',
+        'name': 'Discord',
+        'description': 'Discord chat export (.json)',
+        'extensions': ['.json']
+    },
+    {
+        'id': 'telegram',
+        'name': 'Telegram',
+        'description': 'Telegram chat export (.json)',
+        'extensions': ['.json']
+    },
+    {
+        'id': 'facebook_json',
+        'name': 'Facebook Messenger (JSON)',
+        'description': 'Facebook Messenger JSON export',
+        'extensions': ['.json']
+    },
+    {
+        'id': 'facebook_html',
+        'name': 'Facebook Messenger (HTML)',
+        'description': 'Facebook Messenger HTML export',
+        'extensions': ['.html', '.htm']
+    },
+    {
+        'id': 'instagram',
+        'name': 'Instagram',
+        'description': 'Instagram Direct Messages (.json)',
+        'extensions': ['.json']
+    },
+    {
+        'id': 'imessage_txt',
+        'name': 'iMessage (Text)',
+        'description': 'iMessage text export',
+        'extensions': ['.txt']
+    },
+    {
+        'id': 'imessage_csv',
+        'name': 'iMessage (CSV)',
+        'description': 'iMessage CSV export',
+        'extensions': ['.csv']
+    },
+    {
+        'id': 'email',
+        'name': 'Email',
+        'description': 'Email messages (.eml)',
+        'extensions': ['.eml']
+    },
+    {
+        'id': 'mbox',
+        'name': 'MBOX',
+        'description': 'Email archive (.mbox)',
+        'extensions': ['.mbox']
+    },
+    {
+        'id': 'generic',
+        'name': 'Generic Text',
+        'description': 'Generic text format',
+        'extensions': ['.txt', '.log', '.chat']
+    },
+)
+
+_PLATFORM_BY_ID = {platform['id']: platform for platform in _SUPPORTED_PLATFORMS}
+
+# User-facing error messages; {max_size_mb} and {supported_exts} are filled in
+# from the handler's limits
+_ERROR_MESSAGES = {
+    'file_not_found': "The file could not be found. Please check the file path and try again.",
+    'file_too_large': "The file is too large. Maximum file size is {max_size_mb} MB. Please split the file or compress it.",
+    'file_empty': "The file is empty. Please upload a file with content.",
+    'unsupported_format': "This file format is not supported. Supported formats: {supported_exts}",
+    'parse_error': "The file could not be parsed. Please check the file format and try selecting a different platform.",
+    'unknown_platform': "The platform could not be detected automatically. Please select a platform manually.",
+    'invalid_content': "The file content does not match the expected format for this platform.",
+}
+
+
+class _FileCtx(NamedTuple):
+    """What one upload request needs to know about the file, gathered once."""
+    path: str
+    suffix: str
+
 
 class FileUploadHandler:
     """
@@ -15,11 +110,12 @@ class FileUploadHandler:
     # Maximum file size in MB
     MAX_FILE_SIZE_MB = 100
 
-    # Supported file extensions
-    SUPPORTED_EXTENSIONS = [
+    # Supported file extensions, in the order they are listed to users
+    SUPPORTED_EXTENSIONS_DISPLAY = (
         '.txt', '.csv', '.json', '.xml', '.html', '.htm',
         '.eml', '.mbox', '.pdf', '.docx', '.log', '.chat'
-    ]
+    )
+    SUPPORTED_EXTENSIONS = frozenset(SUPPORTED_EXTENSIONS_DISPLAY)
 
     def __init__(self):
         """Initialize the file upload handler."""
@@ -37,31 +133,44 @@ class FileUploadHandler:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        filepath = Path(filepath)
+        ctx, error = self._prepare(filepath)
+        return ctx is not None, error
+
+    def _prepare(self, filepath: str) -> Tuple[Optional[_FileCtx], Optional[str]]:
+        """
+        Validate an uploaded file and gather what the request needs about it.
 
-        # Check if file exists
-        if not filepath.exists():
-            return False, f"File not found: {filepath}"
+        Args:
+            filepath: Path to the file
+
+        Returns:
+            Tuple of (file context, None) if valid, else (None, error_message)
+        """
+        # One stat answers existence, type and size
+        try:
+            st = os.stat(filepath)
+        except (FileNotFoundError, NotADirectoryError):
+            return None, f"File not found: {filepath}"
 
         # Check if it's a file (not directory)
-        if not filepath.is_file():
-            return False, f"Path is not a file: {filepath}"
+        if not stat.S_ISREG(st.st_mode):
+            return None, f"Path is not a file: {filepath}"
 
         # Check file size
-        file_size_mb = filepath.stat().st_size / (1024 * 1024)
+        file_size_mb = st.st_size / (1024 * 1024)
         if file_size_mb > self.MAX_FILE_SIZE_MB:
-            return False, f"File size ({file_size_mb:.2f} MB) exceeds maximum allowed size ({self.MAX_FILE_SIZE_MB} MB)"
+            return None, f"File size ({file_size_mb:.2f} MB) exceeds maximum allowed size ({self.MAX_FILE_SIZE_MB} MB)"
 
         # Check if file is empty
-        if filepath.stat().st_size == 0:
-            return False, "File is empty"
+        if st.st_size == 0:
+            return None, "File is empty"
 
         # Check file extension
-        extension = filepath.suffix.lower()
+        extension = os.path.splitext(filepath)[1].lower()
         if extension not in self.SUPPORTED_EXTENSIONS:
-            return False, f"Unsupported file extension: {extension}. Supported: {', '.join(self.SUPPORTED_EXTENSIONS)}"
+            return None, f"Unsupported file extension: {extension}. Supported: {', '.join(self.SUPPORTED_EXTENSIONS_DISPLAY)}"
 
-        return True, None
+        return _FileCtx(os.fspath(filepath), extension), None
 
     def detect_platform(self, filepath: str) -> Dict:
         """
@@ -74,8 +183,8 @@ class FileUploadHandler:
             Dictionary with detection results
         """
         # Validate file first
-        is_valid, error = self.validate_file(filepath)
-        if not is_valid:
+        ctx, error = self._prepare(filepath)
+        if ctx is None:
             return {
                 'success': False,
                 'error': error,
@@ -85,16 +194,16 @@ class FileUploadHandler:
 
         try:
             # Auto-detect platform
-            platform = self.import_handler.detect_platform(filepath)
+            platform = self.import_handler.detect_platform(ctx.path)
 
             # Determine confidence based on file characteristics
-            confidence = self._calculate_confidence(filepath, platform)
+            confidence = self._calculate_confidence(ctx.suffix, platform)
 
             return {
                 'success': True,
                 'platform': platform,
                 'confidence': confidence,
-                'extension': Path(filepath).suffix.lower()
+                'extension': ctx.suffix
             }
 
         except Exception as e:
@@ -105,11 +214,8 @@ class FileUploadHandler:
                 'confidence': 0.0
             }
 
-    def _calculate_confidence(self, filepath: str, platform: str) -> float:
-        """Calculate confidence score for platform detection."""
-        filepath = Path(filepath)
-        extension = filepath.suffix.lower()
-
+    def _calculate_confidence(self, extension: str, platform: str) -> float:
+        """Calculate confidence score for platform detection from the file's extension."""
         # High confidence for specific extensions
         high_confidence_map = {
             '.xml': ['sms'],
@@ -150,8 +256,8 @@ class FileUploadHandler:
             Dictionary with processing results
         """
         # Validate file
-        is_valid, error = self.validate_file(filepath)
-        if not is_valid:
+        ctx, error = self._prepare(filepath)
+        if ctx is None:
             return {
                 'success': False,
                 'error': error,
@@ -160,12 +266,12 @@ class FileUploadHandler:
             }
 
         try:
-            # Parse the file
-            messages = self.import_handler.parse_file(filepath, platform)
-
-            # Auto-detect platform if not provided
+            # Auto-detect platform if not provided, once, for parsing and the result
             if platform is None:
-                platform = self.import_handler.detect_platform(filepath)
+                platform = self.import_handler.detect_platform(ctx.path)
+
+            # Parse the file
+            messages = self.import_handler.parse_file(ctx.path, platform)
 
             return {
                 'success': True,
@@ -188,91 +294,13 @@ class FileUploadHandler:
         Get list of supported platforms with descriptions.
 
         Returns:
-            List of platform info dictionaries
+            List of platform info dictionaries (shared; do not modify them)
         """
-        platforms = [
-            {
-                'id': 'whatsapp',
-                'name': 'WhatsApp',
-                'description': 'WhatsApp chat export (.txt)',
-                'extensions': ['.txt']
-            },
-            {
-                'id': 'sms',
-                'name': 'SMS',
-                'description': 'SMS backup (XML or CSV)',
-                'extensions': ['.xml', '.csv']
-            },
-            {
-                'id': 'discord',
-                'name': 'Discord',
-                'description': 'Discord chat export (.json)',
-                'extensions': ['.json']
-            },
-            {
-                'id': 'telegram',
-                'name': 'Telegram',
-                'description': 'Telegram chat export (.json)',
-                'extensions': ['.json']
-            },
-            {
-                'id': 'facebook_json',
-                'name': 'Facebook Messenger (JSON)',
-                'description': 'Facebook Messenger JSON export',
-                'extensions': ['.json']
-            },
-            {
-                'id': 'facebook_html',
-                'name': 'Facebook Messenger (HTML)',
-                'description': 'Facebook Messenger HTML export',
-                'extensions': ['.html', '.htm']
-            },
-            {
-                'id': 'instagram',
-                'name': 'Instagram',
-                'description': 'Instagram Direct Messages (.json)',
-                'extensions': ['.json']
-            },
-            {
-                'id': 'imessage_txt',
-                'name': 'iMessage (Text)',
-                'description': 'iMessage text export',
-                'extensions': ['.txt']
-            },
-            {
-                'id': 'imessage_csv',
-                'name': 'iMessage (CSV)',
-                'description': 'iMessage CSV export',
-                'extensions': ['.csv']
-            },
-            {
-                'id': 'email',
-                'name': 'Email',
-                'description': 'Email messages (.eml)',
-                'extensions': ['.eml']
-            },
-            {
-                'id': 'mbox',
-                'name': 'MBOX',
-                'description': 'Email archive (.mbox)',
-                'extensions': ['.mbox']
-            },
-            {
-                'id': 'generic',
-                'name': 'Generic Text',
-                'description': 'Generic text format',
-                'extensions': ['.txt', '.log', '.chat']
-            },
-        ]
-        return platforms
+        return list(_SUPPORTED_PLATFORMS)
 
     def get_platform_by_id(self, platform_id: str) -> Optional[Dict]:
         """Get platform info by ID."""
-        platforms = self.get_supported_platforms()
-        for platform in platforms:
-            if platform['id'] == platform_id:
-                return platform
-        return None
+        return _PLATFORM_BY_ID.get(platform_id)
 
     def generate_error_message(self, error_type: str, **kwargs) -> str:
         """
@@ -285,21 +313,13 @@ class FileUploadHandler:
         Returns:
             Formatted error message
         """
-        max_size_mb = self.MAX_FILE_SIZE_MB
-        supported_exts = ', '.join(self.SUPPORTED_EXTENSIONS)
-        
-        error_messages = {
-            'file_not_found': "The file could not be found. Please check the file path and try again.",
-            'file_too_large': f"The file is too large. Maximum file size is {max_size_mb} MB. Please split the file or compress it.",
-            'file_empty': "The file is empty. Please upload a file with content.",
-            'unsupported_format': f"This file format is not supported. Supported formats: {supported_exts}",
-            'parse_error': "The file could not be parsed. Please check the file format and try selecting a different platform.",
-            'unknown_platform': "The platform could not be detected automatically. Please select a platform manually.",
-            'invalid_content': "The file content does not match the expected format for this platform.",
-        }
+        message = _ERROR_MESSAGES.get(error_type, "An unknown error occurred.")
+        if '{' in message:
+            message = message.format(
+                max_size_mb=self.MAX_FILE_SIZE_MB,
+                supported_exts=', '.join(self.SUPPORTED_EXTENSIONS_DISPLAY)
+            )
 
-        message = error_messages.get(error_type, "An unknown error occurred.")
-        
         # Add context if provided
         if 'details' in kwargs:
             message += f"\n\nDetails: {kwargs['details']}"
@@ -1,7 +1,20 @@
 from datetime import datetime
-import re
 from typing import Dict, Any
 
+TIMESTAMP_FORMATS = (
+    '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%d/%m/%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M:%S', '%Y-%m-%d %H:%M', '%d/%m/%Y %H:%M', '%m/%d/%Y %H:%M'
+)
+
+# Formats to try when a format last matched. The formats are mutually exclusive
+# except day-first/month-first twins, where day-first has always won, so a
+# remembered month-first format still tries its twin first.
+_FORMAT_ATTEMPTS = {fmt: (fmt,) for fmt in TIMESTAMP_FORMATS}
+_FORMAT_ATTEMPTS['%m/%d/%Y %H:%M:%S'] = ('%d/%m/%Y %H:%M:%S', '%m/%d/%Y %H:%M:%S')
+_FORMAT_ATTEMPTS['%m/%d/%Y %H:%M'] = ('%d/%m/%Y %H:%M', '%m/%d/%Y %H:%M')
+
+_last_good_format = None
+
 def normalize_sender(sender: str) -> str:
     """Normalize sender ID by stripping whitespace and handling aliases."""
     if not sender:
@@ -14,24 +27,48 @@ def normalize_text(text: str) -> str:
     """Clean message contents by removing artifacts and normalizing whitespace."""
     if not text:
         return ''
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
-    return text
+    # str.split() breaks on the same Unicode whitespace as \s and drops the ends
+    return ' '.join(text.split())
+
+def _parse_iso_timestamp(ts: str) -> Any:
+    """Parse the ISO-shaped entries of TIMESTAMP_FORMATS with fromisoformat.
+
+    Only strings laid out exactly like '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S'
+    or '%Y-%m-%d %H:%M' are tried, so nothing is accepted here that the
+    strptime loop would have rejected.
+    """
+    if ts[4:5] == '-' and ts[7:8] == '-' and ts[13:14] == ':' and (
+            (len(ts) == 19 and ts[10] in ' T' and ts[16] == ':') or
+            (len(ts) == 16 and ts[10] == ' ')):
+        try:
+            return datetime.fromisoformat(ts)
+        except ValueError:
+            pass
+    return None
 
 def normalize_timestamp(ts: Any) -> Any:
     """Normalize timestamp to datetime or None."""
+    global _last_good_format
     if isinstance(ts, datetime):
         return ts
     if isinstance(ts, str):
-        formats = [
-            '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%d/%m/%Y %H:%M:%S',
-            '%m/%d/%Y %H:%M:%S', '%Y-%m-%d %H:%M', '%d/%m/%Y %H:%M', '%m/%d/%Y %H:%M'
-        ]
-        for fmt in formats:
+        parsed = _parse_iso_timestamp(ts)
+        if parsed is not None:
+            return parsed
+        # Timestamps from one export share a format, so try the last match first
+        if _last_good_format is not None:
+            for fmt in _FORMAT_ATTEMPTS[_last_good_format]:
+                try:
+                    return datetime.strptime(ts, fmt)
+                except ValueError:
+                    continue
+        for fmt in TIMESTAMP_FORMATS:
             try:
-                return datetime.strptime(ts, fmt)
+                parsed = datetime.strptime(ts, fmt)
             except ValueError:
                 continue
+            _last_good_format = fmt
+            return parsed
     return None
 
 def normalize_message(msg: Dict) -> Dict:
@@ -42,5 +79,22 @@ def normalize_message(msg: Dict) -> Dict:
     return msg
 
 def normalize_messages(messages: list) -> list:
-    """Normalize a list of message dicts."""
-    return [normalize_message(m) for m in messages]
+    """Normalize a list of message dicts.
+
+    Does what normalize_message does for each message, inlined, and parses
+    each distinct timestamp string only once.
+    """
+    parsed_timestamps = {}
+    for msg in messages:
+        sender = msg.get('sender', '')
+        msg['sender'] = sender.strip() if sender else 'Unknown'
+        text = msg.get('text', '')
+        msg['text'] = ' '.join(text.split()) if text else ''
+        ts = msg.get('timestamp', None)
+        if isinstance(ts, str):
+            if ts not in parsed_timestamps:
+                parsed_timestamps[ts] = normalize_timestamp(ts)
+            msg['timestamp'] = parsed_timestamps[ts]
+        else:
+            msg['timestamp'] = normalize_timestamp(ts)
+    return list(messages)
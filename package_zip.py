@@ -3,6 +3,12 @@ import zipfile
 from pathlib import Path
 from typing import List
 
+REPORT_EXTS = frozenset({'.html', '.txt', '.pdf'})
+VIS_EXTS = frozenset({'.png', '.jpg', '.jpeg', '.svg'})
+RAW_EXTS = frozenset({'.json', '.csv'})
+# Formats that are compressed already; deflating them again only costs CPU
+STORED_EXTS = frozenset({'.png', '.jpg', '.jpeg', '.pdf', '.zip', '.docx'})
+
 def package_court_ready_zip(selected_files: List[str], output_zip: str, base_dir: str = 'output') -> str:
     """
     Package selected files into a court-ready zip folder structure.
@@ -25,21 +31,24 @@ def package_court_ready_zip(selected_files: List[str], output_zip: str, base_dir
     # Assign files to folders by extension/type
     for fname in selected_files:
         ext = Path(fname).suffix.lower()
-        if ext in ['.html', '.txt', '.pdf']:
+        if ext in REPORT_EXTS:
             folder_structure['Report'].append(fname)
-        elif ext in ['.png', '.jpg', '.jpeg', '.svg']:
+        elif ext in VIS_EXTS:
             folder_structure['Visualizations'].append(fname)
-        elif ext in ['.json', '.csv']:
+        elif ext in RAW_EXTS:
             folder_structure['RawData'].append(fname)
         else:
             folder_structure['SupportingDocs'].append(fname)
     # Create zip
     zip_path = Path(base_dir) / output_zip
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
         for folder, files in folder_structure.items():
             for file in files:
                 file_path = Path(base_dir) / file
                 if file_path.exists():
                     arcname = f"{folder}/{Path(file).name}"
-                    zipf.write(file_path, arcname)
+                    if file_path.suffix.lower() in STORED_EXTS:
+                        zipf.write(file_path, arcname, compress_type=zipfile.ZIP_STORED)
+                    else:
+                        zipf.write(file_path, arcname)
     return str(zip_path)
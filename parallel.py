@@ -0,0 +1,45 @@
+"""Worker-process policy for scans that can split a conversation into chunks."""
+
+import multiprocessing
+import os
+from typing import List, Optional, Sequence, Tuple
+
+from config.settings import PARALLEL_SCAN, PARALLEL_SCAN_THRESHOLD
+
+
+def scan_workers(item_count: int, workers: Optional[int] = None) -> int:
+    """
+    Decide how many processes should scan item_count messages.
+
+    Args:
+        item_count: Number of messages (or distinct texts) to scan
+        workers: Processes the caller asked for; None leaves it to the
+            PARALLEL_SCAN setting, which uses every CPU when enabled
+
+    Returns:
+        Number of worker processes to use; 1 means scan in this process
+    """
+    if workers is None:
+        # A process that is itself a pool worker (a batch run analyzing one
+        # file per process) would otherwise start a pool per worker
+        if not PARALLEL_SCAN or multiprocessing.parent_process() is not None:
+            return 1
+        workers = os.cpu_count() or 1
+    if item_count < PARALLEL_SCAN_THRESHOLD:
+        return 1
+    return max(1, min(workers, item_count))
+
+
+def split_chunks(items: Sequence, workers: int) -> List[Tuple[int, Sequence]]:
+    """
+    Split items into one contiguous chunk per worker.
+
+    Args:
+        items: Items to split
+        workers: Number of chunks wanted
+
+    Returns:
+        (start index, chunk) pairs, in order
+    """
+    chunk_size = -(-len(items) // workers)
+    return [(start, items[start:start + chunk_size]) for start in range(0, len(items), chunk_size)]
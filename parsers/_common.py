@@ -0,0 +1,35 @@
+"""Helpers shared by the export parsers."""
+
+import json
+import sys
+
+try:
+    import orjson  # Optional: faster parsing when an export is loaded whole
+except ImportError:
+    orjson = None
+
+
+def _interned(value):
+    """Return the interned copy of a plain str; other values are returned as is."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _peek_root(f) -> bytes:
+    """Return the first non-whitespace byte of a binary file and rewind it."""
+    chunk = f.read(64)
+    while chunk and not chunk.strip():
+        chunk = f.read(64)
+    f.seek(0)
+    return chunk.lstrip()[:1]
+
+
+def _load_json(content: bytes):
+    """Decode a whole JSON document, with orjson when it is installed."""
+    if orjson:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Such as NaN or integers wider than 64 bits; the standard
+            # library accepts those, and reports real syntax errors itself
+            pass
+    return json.loads(content)
@@ -2,7 +2,26 @@
 
 import json
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Iterator
+
+from parsers._common import _interned, _load_json, _peek_root
+
+try:
+    import ijson  # Optional: stream messages instead of loading the whole export
+except ImportError:
+    ijson = None
+
+if ijson:
+    _JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError)
+else:
+    _JSON_ERRORS = (json.JSONDecodeError,)
+
+# Timezone suffixes are stripped before parsing, so no format carries one
+TIMESTAMP_FORMATS = (
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S',
+)
 
 
 class DiscordParser:
@@ -11,6 +30,7 @@ class DiscordParser:
     def __init__(self):
         """Initialize the Discord parser."""
         self.messages: List[Dict] = []
+        self._last_format = None
 
     def parse_file(self, filepath: str) -> List[Dict]:
         """
@@ -25,56 +45,108 @@ class DiscordParser:
         self.messages = []
 
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-                # Discord exports can have different structures
-                # Try to handle common formats
-                if isinstance(data, dict) and 'messages' in data:
-                    messages_data = data['messages']
-                elif isinstance(data, list):
-                    messages_data = data
-                else:
-                    raise ValueError("Unsupported Discord export format")
-
-                for msg in messages_data:
-                    message = {
-                        'timestamp': self._parse_timestamp(
-                            msg.get('timestamp', msg.get('time', ''))
-                        ),
-                        'sender': self._get_sender(msg),
-                        'text': msg.get('content', msg.get('message', '')),
-                        'platform': 'discord',
-                        'channel': msg.get('channel', {}).get('name', 'unknown')
+            for msg in self._iter_messages(filepath):
+                # Senders and channels repeat on every message; share one copy
+                message = {
+                    'timestamp': self._parse_timestamp(
+                        msg.get('timestamp', msg.get('time', ''))
+                    ),
+                    'sender': _interned(self._get_sender(msg)),
+                    'text': msg.get('content', msg.get('message', '')),
+                    'platform': 'discord',
+                    'channel': _interned(
+                        msg.get('channel', {}).get('name', 'unknown')
                         if isinstance(msg.get('channel'), dict)
                         else msg.get('channel', 'unknown')
-                    }
-                    self.messages.append(message)
+                    )
+                }
+                self.messages.append(message)
 
-        except json.JSONDecodeError as e:
+        except _JSON_ERRORS as e:
             raise ValueError(f"Error parsing Discord JSON file: {e}")
         except Exception as e:
             raise ValueError(f"Error parsing Discord file: {e}")
 
         return self.messages
 
+    def _iter_messages(self, filepath: str) -> Iterator[Dict]:
+        """
+        Yield the raw message objects of a Discord export.
+
+        With ijson installed the export is streamed one message at a time, so
+        memory stays flat however large the file is; otherwise it is loaded
+        whole, with orjson if available.
+
+        Args:
+            filepath: Path to the Discord JSON export file
+
+        Returns:
+            Iterator over message dictionaries
+        """
+        if not ijson:
+            with open(filepath, 'rb') as f:
+                data = _load_json(f.read())
+
+            # Discord exports can have different structures
+            # Try to handle common formats
+            if isinstance(data, dict) and 'messages' in data:
+                yield from data['messages']
+            elif isinstance(data, list):
+                yield from data
+            else:
+                raise ValueError("Unsupported Discord export format")
+            return
+
+        with open(filepath, 'rb') as f:
+            root = _peek_root(f)
+            if root == b'[':
+                yield from ijson.items(f, 'item', use_float=True)
+                return
+
+            found = False
+            for msg in ijson.items(f, 'messages.item', use_float=True):
+                found = True
+                yield msg
+            if found:
+                return
+
+            # Nothing streamed: tell an empty message list from a missing key
+            f.seek(0)
+            for prefix, event, value in ijson.parse(f):
+                if prefix == '' and event == 'map_key' and value == 'messages':
+                    return
+            raise ValueError("Unsupported Discord export format")
+
     def _parse_timestamp(self, timestamp_str: str) -> datetime:
         """Parse Discord timestamp."""
-        formats = [
-            '%Y-%m-%dT%H:%M:%S.%f%z',
-            '%Y-%m-%dT%H:%M:%S%z',
-            '%Y-%m-%d %H:%M:%S',
-            '%Y-%m-%dT%H:%M:%S.%fZ',
-            '%Y-%m-%dT%H:%M:%SZ',
-        ]
-
-        for fmt in formats:
+        # Remove timezone info for simpler handling
+        ts = timestamp_str.replace('+00:00', '').replace('Z', '')
+
+        # Discord's own ISO layout, 'T' separated with optional 1-6 digit
+        # fraction, parses far faster with fromisoformat than with strptime
+        fraction = ts[20:]
+        if ts[4:5] == '-' and ts[7:8] == '-' and ts[10:11] == 'T' and \
+                ts[13:14] == ':' and ts[16:17] == ':' and (
+                    len(ts) == 19 or (ts[19:20] == '.' and 0 < len(fraction) <= 6
+                                      and fraction.isascii() and fraction.isdigit())):
+            try:
+                return datetime.fromisoformat(ts)
+            except ValueError:
+                pass
+
+        if self._last_format is not None:
+            try:
+                return datetime.strptime(ts, self._last_format)
+            except ValueError:
+                pass
+
+        for fmt in TIMESTAMP_FORMATS:
             try:
-                # Remove timezone info for simpler handling
-                ts = timestamp_str.replace('+00:00', '').replace('Z', '')
-                return datetime.strptime(ts, fmt.replace('%z', ''))
+                parsed = datetime.strptime(ts, fmt)
             except ValueError:
                 continue
+            self._last_format = fmt
+            return parsed
 
         return datetime.now()
 
@@ -90,5 +162,5 @@ class DiscordParser:
         return len(self.messages)
 
     def get_senders(self) -> List[str]:
-        """Get unique list of senders."""
-        return list(set(msg['sender'] for msg in self.messages))
+        """Get unique list of senders, in order of first appearance."""
+        return list(dict.fromkeys(msg['sender'] for msg in self.messages))
@@ -1,10 +1,25 @@
 """Facebook HTML export parser."""
 
+import codecs
+import mmap
+import os
 import re
+import sys
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 from html.parser import HTMLParser
 
+try:
+    from lxml import etree  # Optional: parse the export in C instead of Python callbacks
+except ImportError:
+    etree = None
+
+# Marks an element that has a message container somewhere inside it
+_ENCLOSES_MESSAGE = 'data-encloses-message'
+
+# Bytes of the export decoded and fed to the fallback parser at a time
+_FEED_CHUNK_BYTES = 1 << 20
+
 
 class FacebookHTMLParser:
     """Parser for Facebook Messenger HTML exports."""
@@ -26,15 +41,12 @@ class FacebookHTMLParser:
         self.messages = []
 
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-
-            # Parse messages from HTML
-            # Common pattern: <div class="message">...</div>
-            parser = _FacebookHTMLExtractor()
-            parser.feed(html_content)
-            
-            for msg_data in parser.messages:
+            if etree:
+                extracted = _extract_with_lxml(filepath)
+            else:
+                extracted = _extract_with_html_parser(filepath)
+
+            for msg_data in extracted:
                 message = {
                     'timestamp': msg_data.get('timestamp', datetime.now()),
                     'sender': msg_data.get('sender', 'Unknown'),
@@ -53,8 +65,120 @@ class FacebookHTMLParser:
         return len(self.messages)
 
     def get_senders(self) -> List[str]:
-        """Get unique list of senders."""
-        return list(set(msg['sender'] for msg in self.messages))
+        """Get unique list of senders, in order of first appearance."""
+        return list(dict.fromkeys(msg['sender'] for msg in self.messages))
+
+
+def _build_message(sender: Optional[str], texts: List[str]) -> Optional[Dict]:
+    """
+    Turn the text pieces of one message container into a message.
+
+    Args:
+        sender: Text of the explicit sender element, or None if there was none
+        texts: Stripped, non-blank text pieces outside the sender element
+
+    Returns:
+        Message data, or None if the container holds no message text
+    """
+    if sender is None:
+        # No sender markup: the first piece of text names the sender
+        if not texts:
+            return None
+        sender, texts = texts[0], texts[1:]
+    if not texts:
+        return None
+    # Senders repeat on every message; share one copy
+    return {'sender': sys.intern(sender), 'text': ' '.join(texts), 'timestamp': datetime.now()}
+
+
+def _is_container(el) -> bool:
+    """
+    Whether el looks like a message container: a div whose class mentions
+    'message' or 'msg'. Only innermost containers are messages, so a wrapper
+    such as <div class="messages"> around the whole thread is not one.
+    """
+    classes = el.get('class') or ''
+    return 'message' in classes or 'msg' in classes
+
+
+def _extract_with_lxml(filepath: str) -> List[Dict]:
+    """
+    Extract message data from a Facebook HTML export using lxml.
+
+    The file is parsed incrementally, and each message's subtree is dropped
+    once it has been read, so the document is never held whole in memory.
+    """
+    if os.path.getsize(filepath) == 0:
+        return []
+
+    messages = []
+    for _, div in etree.iterparse(filepath, events=('end',), tag='div',
+                                  html=True, encoding='utf-8'):
+        # Inner divs end first, so any container inside has marked this one
+        if not _is_container(div) or div.get(_ENCLOSES_MESSAGE):
+            continue
+
+        texts = []
+        if div.text and div.text.strip():
+            texts.append(div.text.strip())
+        found = []
+        _collect_texts(div, texts, found)
+
+        sender = None
+        if found:
+            sender = ' '.join(''.join(found[0].itertext()).split()) or None
+        msg_data = _build_message(sender, texts)
+        if msg_data:
+            messages.append(msg_data)
+
+        for ancestor in div.iterancestors():
+            if ancestor.get(_ENCLOSES_MESSAGE):
+                break
+            ancestor.set(_ENCLOSES_MESSAGE, '1')
+        # Nothing before or inside this message is read again
+        div.clear(keep_tail=True)
+        parent = div.getparent()
+        while div.getprevious() is not None:
+            del parent[0]
+    return messages
+
+
+def _extract_with_html_parser(filepath: str) -> List[Dict]:
+    """Extract message data from a Facebook HTML export using html.parser."""
+    parser = _FacebookHTMLExtractor()
+    if os.path.getsize(filepath) == 0:
+        return parser.messages
+
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with open(filepath, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Decode and feed a chunk at a time instead of the whole file as one str
+        for start in range(0, len(mm), _FEED_CHUNK_BYTES):
+            parser.feed(decoder.decode(mm[start:start + _FEED_CHUNK_BYTES]))
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+    return parser.messages
+
+
+def _collect_texts(el, texts: List[str], found: List) -> None:
+    """
+    Walk el's children in document order, collecting non-blank text pieces.
+
+    The first element marked up as the sender is appended to found, and its
+    text is left out of texts.
+    """
+    for child in el:
+        # Comments are children too, but their text is not message text
+        if isinstance(child.tag, str):
+            if not found and (child.tag == 'b' or 'sender' in (child.get('class') or '')):
+                found.append(child)
+            else:
+                if child.text and child.text.strip():
+                    texts.append(child.text.strip())
+                _collect_texts(child, texts, found)
+        # A tail is the text after an element, so it belongs to the parent
+        if child.tail and child.tail.strip():
+            texts.append(child.tail.strip())
 
 
 class _FacebookHTMLExtractor(HTMLParser):
@@ -63,44 +187,76 @@ class _FacebookHTMLExtractor(HTMLParser):
     def __init__(self):
         super().__init__()
         self.messages = []
-        self.current_message = {}
-        self.current_tag = None
-        self.capture_data = False
+        self._div_depth = 0         # open divs inside the current container
+        self._texts = []
+        self._sender_parts = None   # set once a sender element opens
+        self._sender_tag = None     # tag of the sender element while inside it
+        self._sender_nesting = 0
+        self._pending = []          # text seen since the last tag
+
+    def _flush_text(self):
+        """
+        File the text seen since the last tag or comment as one piece. Text
+        can arrive in several calls when the file is fed in chunks.
+        """
+        if not self._pending:
+            return
+        data = ''.join(self._pending)
+        self._pending = []
+        if self._sender_tag:
+            self._sender_parts.append(data)
+        elif data.strip():
+            self._texts.append(data.strip())
 
     def handle_starttag(self, tag, attrs):
         """Handle HTML start tags."""
-        attrs_dict = dict(attrs)
-        
-        # Look for message containers
-        if tag == 'div' and 'class' in attrs_dict:
-            classes = attrs_dict['class']
-            if 'message' in classes or 'msg' in classes:
-                self.current_message = {}
-                self.current_tag = 'message'
+        self._flush_text()
+        classes = dict(attrs).get('class') or ''
+
+        # Look for message containers; one opening inside another replaces it
+        if tag == 'div' and ('message' in classes or 'msg' in classes):
+            self._div_depth = 1
+            self._texts = []
+            self._sender_parts = None
+            self._sender_tag = None
+            return
+        if not self._div_depth:
+            return
+
+        if tag == 'div':
+            self._div_depth += 1
+        if self._sender_tag:
+            if tag == self._sender_tag:
+                self._sender_nesting += 1
+        elif self._sender_parts is None and (tag == 'b' or 'sender' in classes):
+            self._sender_parts = []
+            self._sender_tag = tag
+            self._sender_nesting = 1
 
     def handle_data(self, data):
         """Handle text data in HTML."""
-        if self.current_tag and data.strip():
-            # Simple extraction - look for sender and message patterns
-            # This is a basic implementation; real Facebook HTML can be complex
-            text = data.strip()
-            
-            # Try to identify sender (often first bold text or specific class)
-            if not self.current_message.get('sender'):
-                self.current_message['sender'] = text
-            else:
-                # Assume it's the message content
-                if 'text' not in self.current_message:
-                    self.current_message['text'] = text
-                else:
-                    self.current_message['text'] += ' ' + text
+        if self._div_depth:
+            self._pending.append(data)
+
+    def handle_comment(self, data):
+        """Handle HTML comments, which separate the text around them."""
+        self._flush_text()
 
     def handle_endtag(self, tag):
         """Handle HTML end tags."""
-        if tag == 'div' and self.current_tag == 'message':
-            if self.current_message.get('text'):
-                if 'timestamp' not in self.current_message:
-                    self.current_message['timestamp'] = datetime.now()
-                self.messages.append(self.current_message)
-            self.current_message = {}
-            self.current_tag = None
+        self._flush_text()
+        if not self._div_depth:
+            return
+        if self._sender_tag and tag == self._sender_tag:
+            self._sender_nesting -= 1
+            if not self._sender_nesting:
+                self._sender_tag = None
+        if tag == 'div':
+            self._div_depth -= 1
+            if not self._div_depth:
+                sender = None
+                if self._sender_parts is not None:
+                    sender = ' '.join(''.join(self._sender_parts).split()) or None
+                msg_data = _build_message(sender, self._texts)
+                if msg_data:
+                    self.messages.append(msg_data)
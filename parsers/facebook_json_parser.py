@@ -2,7 +2,19 @@
 
 import json
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Iterator
+
+from parsers._common import _interned, _load_json, _peek_root
+
+try:
+    import ijson  # Optional: stream messages instead of loading the whole export
+except ImportError:
+    ijson = None
+
+if ijson:
+    _JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError)
+else:
+    _JSON_ERRORS = (json.JSONDecodeError,)
 
 
 class FacebookJSONParser:
@@ -25,37 +37,60 @@ class FacebookJSONParser:
         self.messages = []
 
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # Facebook Messenger structure: {participants: [], messages: []}
-            messages_data = data.get('messages', [])
-
-            for msg in messages_data:
+            for msg in self._iter_messages(filepath):
                 # Skip messages without content
                 if 'content' not in msg and 'text' not in msg:
                     continue
 
+                # Senders and types repeat on every message; share one copy
                 message = {
                     'timestamp': self._parse_timestamp(msg.get('timestamp_ms', 0)),
-                    'sender': msg.get('sender_name', 'Unknown'),
+                    'sender': _interned(msg.get('sender_name', 'Unknown')),
                     'text': msg.get('content', msg.get('text', '')),
                     'platform': 'facebook'
                 }
 
                 # Add optional fields
                 if 'type' in msg:
-                    message['type'] = msg['type']
+                    message['type'] = _interned(msg['type'])
 
                 self.messages.append(message)
 
-        except json.JSONDecodeError as e:
+        except _JSON_ERRORS as e:
             raise ValueError(f"Error parsing Facebook JSON file: {e}")
         except Exception as e:
             raise ValueError(f"Error parsing Facebook file: {e}")
 
         return self.messages
 
+    def _iter_messages(self, filepath: str) -> Iterator[Dict]:
+        """
+        Yield the raw message objects of a Facebook Messenger export.
+
+        With ijson installed the export is streamed one message at a time, so
+        memory stays flat however large the file is; otherwise it is loaded
+        whole, with orjson if available.
+
+        Args:
+            filepath: Path to the Facebook JSON export file
+
+        Returns:
+            Iterator over message dictionaries
+        """
+        if not ijson:
+            with open(filepath, 'rb') as f:
+                data = _load_json(f.read())
+
+            # Facebook Messenger structure: {participants: [], messages: []}
+            yield from data.get('messages', [])
+            return
+
+        with open(filepath, 'rb') as f:
+            root = _peek_root(f)
+            if root and root != b'{':
+                raise ValueError("Unsupported Facebook export format")
+            yield from ijson.items(f, 'messages.item', use_float=True)
+
     def _parse_timestamp(self, timestamp_ms: int) -> datetime:
         """Parse timestamp from milliseconds."""
         try:
@@ -68,5 +103,5 @@ class FacebookJSONParser:
         return len(self.messages)
 
     def get_senders(self) -> List[str]:
-        """Get unique list of senders."""
-        return list(set(msg['sender'] for msg in self.messages))
+        """Get unique list of senders, in order of first appearance."""
+        return list(dict.fromkeys(msg['sender'] for msg in self.messages))
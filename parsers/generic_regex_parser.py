@@ -221,8 +221,8 @@ class GenericRegexParser:
         return len(self.messages)
 
     def get_senders(self) -> List[str]:
-        """Get unique list of senders."""
-        return list(set(msg['sender'] for msg in self.messages))
+        """Get unique list of senders, in order of first appearance."""
+        return list(dict.fromkeys(msg['sender'] for msg in self.messages))
 
     @staticmethod
     def get_available_templates() -> List[str]:
@@ -1,7 +1,7 @@
 """Data anonymization tools for privacy protection."""
 
 import re
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List
 import hashlib
 
 
@@ -66,6 +66,23 @@ class DataAnonymizer:
 
         return result
 
+    def anonymize_lines(self, lines: Iterable[str], **options) -> Iterator[str]:
+        """
+        Anonymize text one line at a time, e.g. straight from an open file.
+
+        Only the current line is held in memory, so arbitrarily large files can
+        be processed. Values split across a line break are not detected.
+
+        Args:
+            lines: Iterable of text lines
+            **options: Flags passed through to anonymize_text
+
+        Returns:
+            Iterator of anonymized lines
+        """
+        for line in lines:
+            yield self.anonymize_text(line, **options)
+
     def _anonymize_phones(self, text: str) -> str:
         """Replace phone numbers with anonymized versions."""
         for pattern in self.phone_patterns:
@@ -0,0 +1,37 @@
+"""Tests for the abuse indicator keyword tables."""
+
+import unittest
+from abuse_indicators import ABUSE_INDICATORS, KEYWORD_CATEGORIES, _RAW_INDICATORS
+
+
+class TestAbuseIndicators(unittest.TestCase):
+    """Sanity checks on the built keyword sets."""
+
+    def test_no_concatenated_keywords(self):
+        """A missing comma silently joins two keywords into one long string."""
+        for category, keywords in ABUSE_INDICATORS.items():
+            for keyword in keywords:
+                self.assertLessEqual(len(keyword), 40, f"{category}: {keyword!r}")
+
+    def test_keywords_are_lowercase(self):
+        """Keywords are lowercased at build time."""
+        for keywords in ABUSE_INDICATORS.values():
+            for keyword in keywords:
+                self.assertEqual(keyword, keyword.lower())
+
+    def test_keywords_keep_listed_order(self):
+        """Keywords are deduplicated in listed order, independent of hash seed."""
+        for category, keywords in ABUSE_INDICATORS.items():
+            raw = [keyword.lower() for keyword in _RAW_INDICATORS[category]]
+            self.assertEqual(list(keywords), list(dict.fromkeys(raw)))
+
+    def test_keyword_categories_index(self):
+        """The inverted index covers every keyword in every category."""
+        for category, keywords in ABUSE_INDICATORS.items():
+            for keyword in keywords:
+                self.assertIn(category, KEYWORD_CATEGORIES[keyword])
+        self.assertEqual(len(KEYWORD_CATEGORIES['revenge porn']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
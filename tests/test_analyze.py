@@ -2,60 +2,108 @@ import unittest
 from unittest.mock import patch, MagicMock
 import sys
 import os
+import shutil
+import tempfile
 
 # Add the parent directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from analyze import analyze_text, extract_text_from_pdf, normalize_text
+from analyze import _advanced_engine, analyze_text, analyze_text_advanced, extract_text_from_pdf, iter_pdf_pages, normalize_text
+from pdf_fixtures import write_text_pdf
+
+def indicators(results, category):
+    return [finding["indicator"] for finding in results[category]]
 
 class TestAbuseAnalysis(unittest.TestCase):
 
     def test_analyze_text_no_matches(self):
         text = "This is a normal document with no abuse indicators."
-        results = analyze_text(text)
-        self.assertEqual(results, {})
+        results = analyze_text([{"text": text}])
+        self.assertEqual(results, {"escalation_detected": False})
 
     def test_analyze_text_single_category(self):
         text = "He called me stupid and useless."
-        results = analyze_text(text)
+        results = analyze_text([{"text": text}])
         self.assertIn("Emotional Abuse / Degradation", results)
-        self.assertIn("stupid", results["Emotional Abuse / Degradation"])
-        self.assertIn("useless", results["Emotional Abuse / Degradation"])
+        self.assertIn("stupid", indicators(results, "Emotional Abuse / Degradation"))
+        self.assertIn("useless", indicators(results, "Emotional Abuse / Degradation"))
 
     def test_analyze_text_multiple_categories(self):
         text = "He said I can't spend my money and threatened to hit me."
-        results = analyze_text(text)
+        results = analyze_text([{"text": text}])
         self.assertIn("Financial Control", results)
         self.assertIn("Threats / Intimidation", results)
-        self.assertIn("my money", results["Financial Control"])
-        self.assertIn("hit", results["Threats / Intimidation"])
+        self.assertIn("my money", indicators(results, "Financial Control"))
+        self.assertIn("hit", indicators(results, "Threats / Intimidation"))
 
     def test_case_insensitivity(self):
         text = "HE CALLED ME STUPID."
-        results = analyze_text(text)
+        results = analyze_text([{"text": text}])
         self.assertIn("Emotional Abuse / Degradation", results)
-        self.assertIn("stupid", results["Emotional Abuse / Degradation"])
+        self.assertIn("stupid", indicators(results, "Emotional Abuse / Degradation"))
 
     def test_false_positive_prevention(self):
         # "fat" should not match "father"
         text = "My father went to the store."
-        results = analyze_text(text)
+        results = analyze_text([{"text": text}])
         # Assuming "father" is not a keyword, and "fat" is.
-        # "fat" is in the indicators list.
-        self.assertNotIn("Emotional Abuse / Degradation", results)
+        # "fat" is in the indicators list. A keyword inside a longer word is
+        # only reported as a fuzzy (near) match, never an exact one.
+        self.assertNotIn("exact", [f["type"] for f in results.get("Emotional Abuse / Degradation", [])])
 
         # "hit" should not match "white"
         text = "The wall was painted white."
-        results = analyze_text(text)
-        self.assertNotIn("Threats / Intimidation", results)
+        results = analyze_text([{"text": text}])
+        self.assertNotIn("exact", [f["type"] for f in results.get("Threats / Intimidation", [])])
 
     def test_smart_quotes(self):
         # "don't" uses a straight quote in keywords list
         # We test with a smart quote
         text = "He said don’t go out."
-        results = analyze_text(text)
+        results = analyze_text([{"text": text}])
         self.assertIn("Isolation", results)
-        self.assertIn("don't go out", results["Isolation"])
+        self.assertIn("don't go out", indicators(results, "Isolation"))
+
+    def test_category_filter(self):
+        messages = [{"text": "He called me stupid and said he would kill you."}]
+        results = analyze_text(messages, categories=["Threats / Intimidation"])
+        self.assertIn("Threats / Intimidation", results)
+        self.assertNotIn("Emotional Abuse / Degradation", results)
+        with self.assertRaises(ValueError):
+            analyze_text(messages, categories=["Not A Category"])
+
+    def test_fuzzy_needs_full_length_window(self):
+        # Partial keywords at the edge of the text are not near matches
+        for text, category in [("I love my friends", "Isolation"),
+                               ("thanks for the money", "Financial Control"),
+                               ("I can track your phone", "Isolation")]:
+            results = analyze_text([{"text": text}])
+            self.assertNotIn(category, results, text)
+
+    def test_fuzzy_typo(self):
+        results = analyze_text([{"text": "you have no frends left"}])
+        findings = results["Isolation"]
+        self.assertEqual([(f["indicator"], f["type"]) for f in findings],
+                         [("no friends", "fuzzy")])
+
+    def test_advanced_engine_is_reused(self):
+        first = analyze_text_advanced("you are stupid", ["Emotional Abuse / Degradation"])
+        second = analyze_text_advanced("you are stupid", ("Emotional Abuse / Degradation",))
+        self.assertEqual(first, second)
+        self.assertIn("Emotional Abuse / Degradation", first)
+        # Both calls share one engine, so the second is served from its cache
+        engine = _advanced_engine(("Emotional Abuse / Degradation",))
+        self.assertEqual(list(engine._scores), ["you are stupid"])
+
+    def test_findings_in_time_order(self):
+        timestamps = ["Jan 5 2024", "2024-01-02T00:00:00", None, "03/01/2024",
+                      "2023-12-31", "01/02/2024"]
+        messages = [{"text": "you are stupid", "id": i, "timestamp": ts}
+                    for i, ts in enumerate(timestamps)]
+        results = analyze_text(messages)
+        # Missing first, then unparseable ones in text order, then by time
+        self.assertEqual([f["id"] for f in results["Emotional Abuse / Degradation"]],
+                         [2, 5, 3, 0, 4, 1])
 
     @patch('analyze.PdfReader')
     def test_extract_text_from_pdf(self, mock_pdf_reader):
@@ -77,5 +125,24 @@ class TestAbuseAnalysis(unittest.TestCase):
         text = extract_text_from_pdf("nonexistent.pdf")
         self.assertIsNone(text)
 
+class TestPDFPages(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_iter_pdf_pages_multi_page(self):
+        page_texts = [f"Page {n} says hello" for n in range(1, 13)]
+        filepath = os.path.join(self.temp_dir, "pages.pdf")
+        write_text_pdf(filepath, page_texts)
+        expected = list(enumerate(page_texts, 1))
+        # Every page must come back whole, in order, on every run
+        for _ in range(5):
+            self.assertEqual(list(iter_pdf_pages(filepath)), expected)
+        self.assertEqual(extract_text_from_pdf(filepath),
+                         "".join(text + "\n" for text in page_texts))
+
 if __name__ == '__main__':
     unittest.main()
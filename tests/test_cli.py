@@ -0,0 +1,62 @@
+"""Tests for the command-line interface."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+import cli
+
+
+class TestBatch(unittest.TestCase):
+    """Test batch analysis of several files."""
+
+    def setUp(self):
+        """Set up conversation files and an output directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.temp_dir, 'reports')
+        os.makedirs(self.output_dir)
+        self.inputs = []
+        for name, text in [('first', 'Alice: Hello\nBob: You are stupid\n'),
+                           ('second', "Bob: Don't talk to your friends\nAlice: Why?\n")]:
+            filepath = os.path.join(self.temp_dir, f'{name}.txt')
+            with open(filepath, 'w') as f:
+                f.write(text)
+            self.inputs.append(filepath)
+
+    def tearDown(self):
+        """Clean up test files."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _run_batch(self, inputs):
+        result = CliRunner().invoke(cli.cli, ['batch', *inputs, '-o', self.output_dir,
+                                              '-f', 'json', '--anonymize'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn(f'Successful: {len(inputs)}/{len(inputs)}', result.output)
+        for filepath in inputs:
+            stem = os.path.splitext(os.path.basename(filepath))[0]
+            self.assertTrue(os.path.exists(os.path.join(self.output_dir, f'report_{stem}.json')))
+
+    def test_process_one(self):
+        """Test one file is analyzed, anonymized and reported."""
+        result = cli._process_one(self.inputs[0], self.output_dir, 'json', True)
+        self.assertTrue(result['success'], result.get('error'))
+        self.assertTrue(os.path.exists(result['report']))
+
+    def test_batch_single_file_runs_in_process(self):
+        """Test a single file is analyzed without starting worker processes."""
+        with patch.object(cli, 'ProcessPoolExecutor') as pool:
+            self._run_batch(self.inputs[:1])
+        pool.assert_not_called()
+
+    def test_batch_in_worker_processes(self):
+        """Test several files are analyzed in worker processes."""
+        with patch.object(cli.os, 'cpu_count', return_value=2):
+            self._run_batch(self.inputs)
+
+
+if __name__ == '__main__':
+    unittest.main()
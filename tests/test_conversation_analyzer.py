@@ -1,7 +1,10 @@
 """Tests for conversation analyzer module."""
 
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import parallel
 from conversation_analyzer import ConversationAnalyzer
 
 
@@ -57,6 +60,64 @@ class TestConversationAnalyzer(unittest.TestCase):
         self.assertIn('Alice', freq['sender_counts'])
         self.assertIn('Bob', freq['sender_counts'])
 
+    def test_results_cached_until_messages_change(self):
+        """Test repeated analyses reuse results until messages are replaced or refreshed."""
+        analyzer = ConversationAnalyzer(self.messages)
+        first = analyzer.analyze_abuse_patterns()
+        self.assertIs(analyzer.analyze_abuse_patterns(), first)
+
+        # An edit in the middle of the list, after the results were cached
+        analyzer.messages[1] = dict(analyzer.messages[1], text='I will kill you.')
+        analyzer.refresh()
+        patterns = analyzer.analyze_abuse_patterns()
+        self.assertIsNot(patterns, first)
+        self.assertIn('Threats / Intimidation', patterns)
+        self.assertNotIn('Emotional Abuse / Degradation', patterns)
+
+        analyzer.messages = analyzer.messages[:1]
+        self.assertEqual(analyzer.analyze_abuse_patterns(), {})
+
+    def test_parallel_scan_matches_serial(self):
+        """Test scanning in worker processes gives the same results as one process."""
+        texts = ["You're stupid and worthless.", "Don't talk to your friends.",
+                 'Hello, how are you?', 'Give me your paycheck or I will hurt you.', '']
+        messages = [{'timestamp': datetime(2024, 1, 1) + timedelta(minutes=i),
+                     'sender': ('Alice', 'Bob')[i % 2], 'text': texts[i % len(texts)],
+                     'platform': 'test'} for i in range(60)]
+
+        serial = ConversationAnalyzer(messages, workers=1)
+        with patch.object(parallel, 'PARALLEL_SCAN_THRESHOLD', 10):
+            parallel_run = ConversationAnalyzer(messages, workers=3)
+            self.assertEqual(parallel.scan_workers(48, parallel_run.workers), 3)
+            self.assertEqual(parallel_run.analyze_abuse_patterns(), serial.analyze_abuse_patterns())
+            self.assertEqual(parallel_run.analyze_power_dynamics(), serial.analyze_power_dynamics())
+
+    def test_parallel_scan_is_opt_in(self):
+        """Test large conversations are scanned in this process unless asked otherwise."""
+        with patch.object(parallel, 'PARALLEL_SCAN', False):
+            self.assertEqual(parallel.scan_workers(10 ** 6), 1)
+        self.assertEqual(parallel.scan_workers(10 ** 6, 1), 1)
+
+    def test_command_phrases_match_whole_words(self):
+        """Test command phrases are counted only as whole words."""
+        messages = self.messages + [
+            {'sender': 'Alice', 'text': 'Lego, égo and ago are not commands', 'platform': 'test'}
+        ]
+        analyzer = ConversationAnalyzer(messages)
+        stats = analyzer.analyze_power_dynamics()['sender_statistics']
+
+        self.assertEqual(stats['Bob']['command_count'], 1)
+        self.assertEqual(stats['Alice']['command_count'], 0)
+
+    def test_keywords_do_not_span_messages(self):
+        """Test a keyword split across consecutive messages is not matched."""
+        messages = [
+            {'sender': 'Bob', 'text': 'You are so stu', 'platform': 'test'},
+            {'sender': 'Bob', 'text': 'pid', 'platform': 'test'}
+        ]
+        analyzer = ConversationAnalyzer(messages)
+        self.assertEqual(analyzer.analyze_abuse_patterns(), {})
+
     def test_empty_messages(self):
         """Test with empty message list."""
         analyzer = ConversationAnalyzer([])
@@ -1,7 +1,10 @@
 """Tests for DARVO analyzer module."""
 
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import parallel
 from darvo_analyzer import DARVOAnalyzer
 
 
@@ -104,6 +107,23 @@ class TestDARVOAnalyzer(unittest.TestCase):
         self.assertTrue(forensic['darvo_components_present']['reverse'])
         self.assertTrue(forensic['full_darvo_pattern_detected'])
 
+    def test_parallel_classification_matches_serial(self):
+        """Test classifying in worker processes gives the same results as one process."""
+        templates = [msg['text'] for msg in self.messages_with_darvo] + ['See you at {i}.']
+        messages = [{'timestamp': datetime(2024, 1, 1) + timedelta(hours=i),
+                     'sender': 'Abuser' if i % 3 else 'Victim',
+                     'text': f"{templates[i % len(templates)]} #{i}".format(i=i),
+                     'platform': 'test'} for i in range(40)]
+
+        def analyze(workers):
+            results = DARVOAnalyzer(messages=messages, workers=workers).analyze_darvo_patterns()
+            del results['forensic_summary']['analysis_date']
+            return results
+
+        serial = analyze(1)
+        with patch.object(parallel, 'PARALLEL_SCAN_THRESHOLD', 10):
+            self.assertEqual(analyze(3), serial)
+
     def test_severity_calculation(self):
         """Test severity score calculation."""
         analyzer = DARVOAnalyzer(messages=self.messages_with_darvo)
@@ -169,6 +189,34 @@ class TestDARVOAnalyzer(unittest.TestCase):
         self.assertIn('deny_patterns', results)
         self.assertIn('attack_patterns', results)
 
+    def test_keywords_match_whole_words_only(self):
+        """Test keywords inside longer words and keyword-free messages are not reported."""
+        messages = [
+            {'sender': 'A', 'text': "You're crazyhorse fans", 'platform': 'test'},
+            {'sender': 'A', 'text': 'See you at dinner', 'platform': 'test'},
+            {'sender': 'A', 'text': "You're crazy", 'platform': 'test'}
+        ]
+        analyzer = DARVOAnalyzer(messages=messages)
+        results = analyzer.analyze_darvo_patterns()
+
+        instances = results['attack_patterns']['credibility_attacks']['instances']
+        self.assertEqual([inst['text'] for inst in instances], ["You're crazy"])
+        self.assertEqual(results['forensic_summary']['instance_counts']['attack_instances'], 1)
+
+    def test_repeated_messages_counted_individually(self):
+        """Test identical messages are each reported with their own sender."""
+        messages = [
+            {'sender': 'A', 'text': 'I never said that', 'platform': 'test'},
+            {'sender': 'B', 'text': 'hello', 'platform': 'test'},
+            {'sender': 'C', 'text': 'I never said that', 'platform': 'test'}
+        ]
+        analyzer = DARVOAnalyzer(messages=messages)
+        results = analyzer.analyze_darvo_patterns()
+
+        denial = results['deny_patterns']['outright_denial']
+        self.assertEqual(denial['count'], 2)
+        self.assertEqual([inst['sender'] for inst in denial['instances']], ['A', 'C'])
+
     def test_text_analysis(self):
         """Test document text analysis."""
         text = "I never said that. You're making things up. You're crazy and unstable. I'm the victim here. You're abusing me. Everyone will see the truth."
@@ -4,7 +4,11 @@ import unittest
 import tempfile
 import os
 from pathlib import Path
+from unittest.mock import patch
+import data_processor
 from data_processor import DataProcessor
+from exports import Exporter
+from pdf_fixtures import write_text_pdf
 
 
 class TestDataProcessor(unittest.TestCase):
@@ -42,6 +46,68 @@ class TestDataProcessor(unittest.TestCase):
         with self.assertRaises(FileNotFoundError):
             DataProcessor('/nonexistent/file.txt')
 
+    def test_process_conversation_returns_results(self):
+        """Test conversation files are analyzed and the results returned."""
+        filepath = os.path.join(self.temp_dir, 'chat.txt')
+        with open(filepath, 'w') as f:
+            f.write('Alice: Hello\nBob: You are stupid\n')
+
+        processor = DataProcessor(filepath)
+        results = processor.process(platform='generic')
+        self.assertEqual(results['analysis_type'], 'conversation_analysis')
+        self.assertIs(processor.processed_data, results)
+
+    def test_process_pdf(self):
+        """Test PDF files are extracted and scanned for abuse indicators."""
+        filepath = os.path.join(self.temp_dir, 'statement.pdf')
+        write_text_pdf(filepath, ['He called me stupid', 'and said he would kill you'])
+
+        results = DataProcessor(filepath).process()
+        self.assertEqual(results['analysis_type'], 'document_analysis')
+        self.assertEqual(results['total_pages'], 2)
+        self.assertFalse(results['truncated'])
+        patterns = results['abuse_patterns']
+        self.assertEqual(patterns['Emotional Abuse / Degradation'], ['stupid'])
+        self.assertIn('Threats / Intimidation', patterns)
+        self.assertNotIn('escalation_detected', patterns)
+
+        # Both exporters read abuse_patterns as {category: [keyword]}
+        txt_path = os.path.join(self.temp_dir, 'statement.txt')
+        DataProcessor(filepath).export_results(results, txt_path, format='txt')
+        with open(txt_path, encoding='utf-8') as f:
+            self.assertIn('Found: stupid', f.read())
+        csv_path = Exporter(self.temp_dir).export(results, 'csv', 'statement.csv')
+        with open(csv_path, encoding='utf-8') as f:
+            self.assertIn('Emotional Abuse / Degradation,stupid', f.read())
+
+    def test_process_pdf_stops_at_text_limit(self):
+        """Test PDF extraction stops once the text passes MAX_PDF_TEXT_CHARS."""
+        filepath = os.path.join(self.temp_dir, 'long.pdf')
+        pages = [f'Page {n} of the statement' for n in range(1, 6)]
+        write_text_pdf(filepath, pages)
+
+        data_processor._extract_pdf_text.cache_clear()
+        self.addCleanup(data_processor._extract_pdf_text.cache_clear)
+        with patch.object(data_processor, 'MAX_PDF_TEXT_CHARS', len(pages[0]) + 5):
+            processor = DataProcessor(filepath)
+            results = processor.process()
+            text = processor.get_text_content()
+
+        self.assertTrue(results['truncated'])
+        self.assertEqual(results['total_pages'], 5)
+        # The first two pages pass the limit, so the rest are never read
+        self.assertEqual(text, pages[0] + '\n' + pages[1] + '\n')
+        self.assertEqual(results['text_length'], len(text))
+
+    def test_process_unsupported_type(self):
+        """Test processing an unsupported file type raises ValueError."""
+        filepath = os.path.join(self.temp_dir, 'test.xyz')
+        with open(filepath, 'w') as f:
+            f.write('data')
+
+        with self.assertRaises(ValueError):
+            DataProcessor(filepath).process()
+
     def test_get_text_content(self):
         """Test text content extraction."""
         filepath = os.path.join(self.temp_dir, 'test.txt')
@@ -53,6 +119,30 @@ class TestDataProcessor(unittest.TestCase):
         content = processor.get_text_content()
         self.assertEqual(content, test_content)
 
+    def test_get_json_content(self):
+        """Test JSON content is returned as written unless reformatting is asked for."""
+        filepath = os.path.join(self.temp_dir, 'test.json')
+        with open(filepath, 'w') as f:
+            f.write('{"sender": "Alice", "text": "Hi"}')
+
+        processor = DataProcessor(filepath)
+        self.assertEqual(processor.get_text_content(), '{"sender": "Alice", "text": "Hi"}')
+        self.assertEqual(processor.get_text_content(pretty_json=True),
+                         '{\n  "sender": "Alice",\n  "text": "Hi"\n}')
+
+    def test_get_text_content_rereads_modified_file(self):
+        """Test cached text content is refreshed when the file changes."""
+        filepath = os.path.join(self.temp_dir, 'test.txt')
+        with open(filepath, 'w') as f:
+            f.write('First version')
+
+        processor = DataProcessor(filepath)
+        self.assertEqual(processor.get_text_content(), 'First version')
+
+        with open(filepath, 'w') as f:
+            f.write('Second, longer version')
+        self.assertEqual(processor.get_text_content(), 'Second, longer version')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -31,6 +31,15 @@ class TestDataAnonymizer(unittest.TestCase):
         self.assertNotIn('555-123-4567', result)
         self.assertIn('[PHONE-', result)
 
+    def test_anonymize_lines(self):
+        """Test line-by-line anonymization keeps line structure."""
+        lines = ["Call me at 555-123-4567\n", "no contact info here\n"]
+        result = list(self.anonymizer.anonymize_lines(lines))
+
+        self.assertEqual(len(result), 2)
+        self.assertIn('[PHONE-', result[0])
+        self.assertEqual(result[1], "no contact info here\n")
+
     def test_anonymize_conversation(self):
         """Test conversation anonymization."""
         messages = [
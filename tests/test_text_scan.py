@@ -0,0 +1,50 @@
+"""Tests for the shared whole-word keyword matcher."""
+
+import unittest
+from unittest.mock import patch
+
+import text_scan
+from text_scan import KeywordMatcher, on_utf8_word_boundary, on_word_boundary
+
+
+class TestWordBoundaries(unittest.TestCase):
+    """Test the str and UTF-8 boundary checks agree."""
+
+    def test_boundaries(self):
+        """A match is a whole word only if neither neighbour is a word character."""
+        for text, start, end, expected in [
+            ('go now', 0, 2, True),
+            ('ago now', 1, 3, False),
+            ('égo', 1, 3, False),
+            ('go_on', 0, 2, False),
+            ('«go»', 1, 3, True),
+            ('日本go', 2, 4, False),
+        ]:
+            self.assertEqual(on_word_boundary(text, start, end), expected, text)
+            data = text.encode('utf-8')
+            byte_start = len(text[:start].encode('utf-8'))
+            byte_end = len(text[:end].encode('utf-8'))
+            self.assertEqual(on_utf8_word_boundary(data, byte_start, byte_end), expected, text)
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Test both matching backends report the same whole-word matches."""
+
+    words = ('go', 'let go', 'stupid', 'ça')
+    texts = ['Let go of it', 'STUPID égo', 'ago', '', 'ça va, go_on, «go»', 'stu', 'pid']
+    expected = [(0, 1), (0, 0), (1, 2), (4, 3), (4, 0)]
+
+    def test_automaton(self):
+        """Test the Aho-Corasick backend."""
+        with patch.object(text_scan, 'hyperscan', None):
+            matcher = KeywordMatcher(self.words)
+        self.assertEqual(matcher.scan(self.texts), self.expected)
+
+    @unittest.skipUnless(text_scan.hyperscan, 'hyperscan is not installed')
+    def test_hyperscan(self):
+        """Test the Hyperscan backend."""
+        self.assertEqual(KeywordMatcher(self.words).scan(self.texts), self.expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
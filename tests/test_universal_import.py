@@ -4,10 +4,15 @@ import unittest
 import tempfile
 import os
 import json
+from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 
 from universal_import_handler import UniversalImportHandler
+from parsers.discord_parser import DiscordParser
 from parsers.facebook_json_parser import FacebookJSONParser
+from parsers import facebook_html_parser
+from parsers.facebook_html_parser import FacebookHTMLParser
 from parsers.instagram_json_parser import InstagramJSONParser
 from parsers.imessage_txt_parser import iMessageTxtParser
 from parsers.imessage_csv_parser import iMessageCSVParser
@@ -99,6 +104,109 @@ class TestFacebookJSONParser(unittest.TestCase):
         self.assertEqual(messages[0]['platform'], 'facebook')
 
 
+class TestDiscordParser(unittest.TestCase):
+    """Test Discord JSON parser."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.parser = DiscordParser()
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test files."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, data):
+        filepath = os.path.join(self.temp_dir, 'discord.json')
+        with open(filepath, 'w') as f:
+            json.dump(data, f)
+        return filepath
+
+    def test_parse_discord_export_object_and_list(self):
+        """Test both the {messages: [...]} and bare list export layouts."""
+        messages_data = [
+            {
+                'timestamp': '2021-01-01T00:00:00.123+00:00',
+                'author': {'name': 'User1'},
+                'content': 'Hello',
+                'channel': {'name': 'general'}
+            },
+            {
+                'timestamp': '2021-01-01T00:01:00Z',
+                'author': 'User2',
+                'content': 'Hi there'
+            }
+        ]
+
+        for data in ({'guild': {'id': '1'}, 'messages': messages_data}, messages_data):
+            messages = self.parser.parse_file(self._write(data))
+            self.assertEqual([m['sender'] for m in messages], ['User1', 'User2'])
+            self.assertEqual(self.parser.get_senders(), ['User1', 'User2'])
+            self.assertEqual(messages[0]['channel'], 'general')
+            self.assertEqual(messages[0]['timestamp'], datetime(2021, 1, 1, 0, 0, 0, 123000))
+            self.assertEqual(messages[1]['timestamp'], datetime(2021, 1, 1, 0, 1))
+
+    def test_parse_discord_export_without_messages(self):
+        """Test an object without a messages list is rejected."""
+        with self.assertRaises(ValueError):
+            self.parser.parse_file(self._write({'guild': {'id': '1'}}))
+        self.assertEqual(self.parser.parse_file(self._write({'messages': []})), [])
+
+
+class TestFacebookHTMLParser(unittest.TestCase):
+    """Test Facebook HTML parser."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.parser = FacebookHTMLParser()
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test files."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_parse_facebook_html(self):
+        """Test messages with nested markup keep their sender and full text."""
+        html = (
+            '<html><body><div class="messages">'
+            '<div class="message"><div class="sender">User1</div>'
+            '<div><p>Hello <i>there</i></p></div></div>'
+            '<div class="message"><b>User2</b> Hi back</div>'
+            '</div></body></html>'
+        )
+        filepath = os.path.join(self.temp_dir, 'facebook.html')
+        with open(filepath, 'w') as f:
+            f.write(html)
+
+        messages = self.parser.parse_file(filepath)
+        self.assertEqual([(m['sender'], m['text']) for m in messages],
+                         [('User1', 'Hello there'), ('User2', 'Hi back')])
+        self.assertEqual(messages[0]['platform'], 'facebook')
+
+    def test_parse_facebook_html_without_lxml(self):
+        """Test the html.parser fallback joins text split across feed chunks."""
+        html = (
+            '<html><body><div class="messages">'
+            '<div class="message"><div class="sender">Zoë Ångström</div>'
+            '<div><p>héllo 日本 <i>unbelievably</i> long</p></div></div>'
+            '<div class="message"><b>User2</b> Hi <!-- note --> back</div>'
+            '</div></body></html>'
+        )
+        filepath = os.path.join(self.temp_dir, 'facebook.html')
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(html)
+
+        # Chunks of 5 bytes split the multi-byte characters and every word
+        with patch.object(facebook_html_parser, 'etree', None), \
+                patch.object(facebook_html_parser, '_FEED_CHUNK_BYTES', 5):
+            messages = self.parser.parse_file(filepath)
+        self.assertEqual([(m['sender'], m['text']) for m in messages],
+                         [('Zoë Ångström', 'héllo 日本 unbelievably long'),
+                          ('User2', 'Hi back')])
+
+
 class TestInstagramJSONParser(unittest.TestCase):
     """Test Instagram JSON parser."""
 
@@ -0,0 +1,159 @@
+"""Whole-word keyword matching shared by the analyzers."""
+
+import re
+from typing import List, Sequence, Tuple
+
+import ahocorasick
+import numpy as np
+
+try:
+    import hyperscan  # Optional: SIMD multi-pattern matching
+except ImportError:
+    hyperscan = None
+
+
+def is_word_char(char: str) -> bool:
+    """Whether char is a regex \\w character."""
+    return char.isalnum() or char == '_'
+
+
+def on_word_boundary(text: str, start: int, end: int) -> bool:
+    """Whether text[start:end] is a whole word, as a regex \\b...\\b match would be."""
+    if start > 0 and is_word_char(text[start - 1]):
+        return False
+    if end < len(text) and is_word_char(text[end]):
+        return False
+    return True
+
+
+def on_utf8_word_boundary(data: bytes, start: int, end: int) -> bool:
+    """Whether UTF-8 data[start:end] is a whole word, judging neighbours as str would."""
+    if start > 0:
+        lead = start - 1
+        # Step back over continuation bytes to the start of the previous character
+        while data[lead] & 0xC0 == 0x80:
+            lead -= 1
+        if is_word_char(data[lead:start].decode('utf-8')):
+            return False
+    if end < len(data):
+        after = data[end:end + 4].decode('utf-8', 'ignore')[:1]
+        if is_word_char(after):
+            return False
+    return True
+
+
+def corpus_starts(texts) -> List[int]:
+    """Offset of each text (str or bytes) in the texts joined by single newlines."""
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + 1
+    return starts
+
+
+class KeywordMatcher:
+    """
+    Finds whole-word, case-insensitive occurrences of a fixed list of words
+    in many texts with one scan.
+
+    Uses a Hyperscan database when the hyperscan package is installed and an
+    Aho-Corasick automaton otherwise; both report the same matches.
+    """
+
+    def __init__(self, words: Sequence[str]):
+        """
+        Build the matching structure.
+
+        Args:
+            words: Distinct lowercased words; a match reports its index here
+        """
+        self.words = tuple(words)
+        if hyperscan:
+            self._database = self._compile_database()
+        else:
+            self._database = None
+            self._automaton = ahocorasick.Automaton()
+            for word_id, word in enumerate(self.words):
+                self._automaton.add_word(word, (word_id, len(word)))
+            self._automaton.make_automaton()
+
+    def _compile_database(self):
+        """Compile every word into one caseless Hyperscan block database."""
+        self._byte_lengths = tuple(len(word.encode('utf-8')) for word in self.words)
+        database = hyperscan.Database()
+        # Hyperscan's \b only knows ASCII word characters, so matches next to
+        # a non-ASCII byte are checked again in scan. A word that starts or
+        # ends with a non-ASCII character gets no \b on that side, and all of
+        # its matches are checked. That recheck can reject a first
+        # occurrence, so every occurrence is reported.
+        expressions = []
+        for word in self.words:
+            pattern = re.escape(word).encode('utf-8')
+            if word[:1].isascii():
+                pattern = rb'\b' + pattern
+            if word[-1:].isascii():
+                pattern = pattern + rb'\b'
+            expressions.append(pattern)
+        self._always_check = frozenset(
+            word_id for word_id, word in enumerate(self.words) if not (word[:1].isascii() and word[-1:].isascii())
+        )
+        database.compile(
+            expressions=expressions,
+            ids=list(range(len(self.words))),
+            elements=len(self.words),
+            flags=[hyperscan.HS_FLAG_CASELESS] * len(self.words),
+        )
+        return database
+
+    def scan(self, texts: List[str]) -> List[Tuple[int, int]]:
+        """
+        Find every whole-word occurrence of the words in texts.
+
+        All texts are lowercased and scanned as one newline-joined corpus; no
+        word contains a newline, so no match spans two texts, and the
+        separator acts as a word boundary. Each match is assigned to its
+        text by a binary search over the text start offsets.
+
+        Args:
+            texts: Texts to scan, as written
+
+        Returns:
+            (text index, word index) for each occurrence, in order of where
+            it ends; of those ending together, the longest comes first
+        """
+        # Lowercased for both backends, since str.lower() can also change
+        # the neighbours a boundary is judged on
+        lowered = [text.lower() for text in texts]
+        found = []
+        if self._database is not None:
+            encoded = [text.encode('utf-8') for text in lowered]
+            data = b'\n'.join(encoded)
+            starts = corpus_starts(encoded)
+            byte_lengths = self._byte_lengths
+            always_check = self._always_check
+
+            def on_match(word_id, start, end, flags, context):
+                start = end - byte_lengths[word_id]
+                if (word_id in always_check or (start > 0 and data[start - 1] >= 0x80)
+                        or (end < len(data) and data[end] >= 0x80)) \
+                        and not on_utf8_word_boundary(data, start, end):
+                    return
+                found.append((end, start, word_id))
+
+            self._database.scan(data, match_event_handler=on_match)
+            # Hyperscan does not fix the order of matches ending together;
+            # report those longest first, as the automaton does
+            found.sort()
+        else:
+            corpus = '\n'.join(lowered)
+            starts = corpus_starts(lowered)
+            for end, (word_id, length) in self._automaton.iter(corpus):
+                start = end - length + 1
+                if on_word_boundary(corpus, start, end + 1):
+                    found.append((end + 1, start, word_id))
+
+        if not found:
+            return []
+        owners = np.searchsorted(np.array(starts), np.array([start for _, start, _ in found]), side='right') - 1
+        return list(zip(owners.tolist(), [word_id for _, _, word_id in found]))